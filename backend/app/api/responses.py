@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, AsyncIterator, Mapping, Sequence
+
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class ModelListResponse(Response):
+    """JSON response that validates and serialises a list of rows in one pass.
+
+    Used by list endpoints declared with ``response_model=None``: the rows are
+    plain dicts from the converters, so the list ``TypeAdapter`` validates and
+    dumps them in single pydantic-core calls instead of building one model per
+    row and re-validating it in FastAPI.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter[Any],
+        rows: Sequence[Mapping[str, Any]],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(adapter.dump_json(adapter.validate_python(rows)), **kwargs)
+
+
+async def _json_array_chunks(
+    adapter: TypeAdapter[Any],
+    head: bytes,
+    batches: AsyncIterator[Sequence[Mapping[str, Any]]],
+) -> AsyncIterator[bytes]:
+    empty = head == b"[]"
+    if not empty:
+        yield head[:-1]
+    try:
+        async for rows in batches:
+            if not rows:
+                continue
+            body = adapter.dump_json(adapter.validate_python(rows))
+            # Splice each batch's array body into one enclosing JSON array.
+            yield (b"[" if empty else b",") + body[1:-1]
+            empty = False
+    except Exception:
+        # The status line has already been sent, so the client only sees a
+        # truncated body; make sure the cause is recorded.
+        logger.exception("List response failed after streaming had started.")
+        raise
+    yield b"[]" if empty else b"]"
+
+
+class ModelListStreamingResponse(StreamingResponse):
+    """Streaming counterpart of ``ModelListResponse`` for unbounded lists.
+
+    Rows arrive in batches from an async iterator; each batch is validated and
+    dumped with the list ``TypeAdapter`` and sent as soon as it is ready, so
+    the full list is never held in memory at once. Build it with
+    ``from_batches`` so the first batch is validated before anything is sent.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter[Any],
+        head: bytes,
+        batches: AsyncIterator[Sequence[Mapping[str, Any]]],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(_json_array_chunks(adapter, head, batches), **kwargs)
+
+    @classmethod
+    async def from_batches(
+        cls,
+        adapter: TypeAdapter[Any],
+        batches: AsyncIterator[Sequence[Mapping[str, Any]]],
+        **kwargs: Any,
+    ) -> "ModelListStreamingResponse":
+        first = await anext(batches, [])
+        head = adapter.dump_json(adapter.validate_python(first))
+        return cls(adapter, head, batches, **kwargs)
@@ -3,23 +3,33 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...db.session import get_db
 from ...models import ModelConfig
 from ...schemas import ModelConfigCreate, ModelConfigRead, ModelConfigUpdate
-from ...services.converters import model_config_to_read
+from ...services.converters import model_config_to_dict, model_config_to_read
 from ...utils.json import dump_dict
+from ..responses import ModelListResponse
 
 router = APIRouter()
 
+_MODEL_CONFIG_LIST = TypeAdapter(List[ModelConfigRead])
 
-@router.get("/model-configs", response_model=List[ModelConfigRead])
-async def list_model_configs(session: AsyncSession = Depends(get_db)):
+
+@router.get(
+    "/model-configs",
+    response_model=None,
+    responses={200: {"model": List[ModelConfigRead]}},
+)
+async def list_model_configs(session: AsyncSession = Depends(get_db)) -> ModelListResponse:
     result = await session.execute(select(ModelConfig).order_by(ModelConfig.created_at.desc()))
     configs = result.scalars().all()
-    return [model_config_to_read(config) for config in configs]
+    return ModelListResponse(
+        _MODEL_CONFIG_LIST, [model_config_to_dict(config) for config in configs]
+    )
 
 
 @router.post("/model-configs", response_model=ModelConfigRead, status_code=status.HTTP_201_CREATED)
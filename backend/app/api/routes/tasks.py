@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
 
 from ...schemas import TaskRequest
 from ...services.tasks import (
@@ -47,5 +47,5 @@ async def persist_task_log_endpoint(task_id: str):
 
 
 @router.get("/tasks/{task_id}/log/download")
-async def download_task_log_endpoint(task_id: str):
-    return await get_task_log_file(task_id)
+async def download_task_log_endpoint(task_id: str, accept_encoding: str = Header("")):
+    return await get_task_log_file(task_id, accept_encoding)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,17 +11,25 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ...db.session import get_db
 from ...models import TestCase
 from ...schemas import TestCaseCreate, TestCaseRead, TestCaseUpdate
-from ...services.converters import test_case_to_read
+from ...services.converters import test_case_to_dict, test_case_to_read
+from ...services.test_runs import invalidate_test_case_cache
 from ...utils.json import dump_list
+from ..responses import ModelListResponse
 
 router = APIRouter()
 
+_TEST_CASE_LIST = TypeAdapter(List[TestCaseRead])
 
-@router.get("/test-cases", response_model=List[TestCaseRead])
-async def list_test_cases(session: AsyncSession = Depends(get_db)):
+
+@router.get(
+    "/test-cases",
+    response_model=None,
+    responses={200: {"model": List[TestCaseRead]}},
+)
+async def list_test_cases(session: AsyncSession = Depends(get_db)) -> ModelListResponse:
     result = await session.execute(select(TestCase).order_by(TestCase.created_at.desc()))
     cases = result.scalars().all()
-    return [test_case_to_read(case) for case in cases]
+    return ModelListResponse(_TEST_CASE_LIST, [test_case_to_dict(case) for case in cases])
 
 
 @router.post("/test-cases", response_model=TestCaseRead, status_code=status.HTTP_201_CREATED)
@@ -78,6 +87,7 @@ async def update_test_case(
     except IntegrityError as exc:
         await session.rollback()
         raise HTTPException(status_code=400, detail="Test case reference must be unique.") from exc
+    invalidate_test_case_cache(test_case_id)
 
     await session.refresh(test_case)
     return test_case_to_read(test_case)
@@ -91,3 +101,4 @@ async def delete_test_case(test_case_id: int, session: AsyncSession = Depends(ge
 
     await session.delete(test_case)
     await session.commit()
+    invalidate_test_case_cache(test_case_id)
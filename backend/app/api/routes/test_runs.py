@@ -1,27 +1,38 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import defer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...db.session import get_db
 from ...models import ModelConfig, TestCase, TestRun
-from ...schemas import QualityInsightsResponse, TestRunRead, TestRunRequest
-from ...services.converters import test_run_to_read
+from ...schemas import QualityInsightsResponse, TestRunRead, TestRunRequest, TestRunSummary
+from ...services.converters import (
+    test_run_to_dict,
+    test_run_to_read,
+    test_run_to_summary_dict,
+)
 from ...services.llm import get_prompt_template
 from ...services.test_runs import (
-    append_run_log_entry,
     build_prompt_for_case,
+    build_run_log_entry,
     compute_quality_insights,
-    run_queue,
+    enqueue_test_runs,
 )
 from ...services.vector_memory import append_memory_to_text, fetch_relevant_memory
 from ...utils.json import dump_dict, load_string_list
+from ..responses import ModelListStreamingResponse
 
 router = APIRouter()
 
+_TEST_RUN_LIST = TypeAdapter(List[TestRunRead])
+_TEST_RUN_SUMMARY_LIST = TypeAdapter(List[TestRunSummary])
+_TEST_RUN_STREAM_BATCH = 100
+
 
 @router.post("/test-runs", response_model=List[TestRunRead], status_code=status.HTTP_201_CREATED)
 async def queue_test_runs(
@@ -62,7 +73,7 @@ async def queue_test_runs(
         prompt_template = await get_prompt_template(session, payload.prompt_id)
         prompt_override = prompt_template.template
 
-    created_runs: List[TestRun] = []
+    run_values: List[Dict[str, Any]] = []
     for case_id in payload.test_case_ids:
         test_case = test_cases[case_id]
         prompt = build_prompt_for_case(test_case, prompt_override)
@@ -76,32 +87,52 @@ async def queue_test_runs(
             limit=3,
         )
         prompt = append_memory_to_text(prompt, matches)
-        run = TestRun(
-            test_case_id=test_case.id,
-            model_config_id=model_config_id,
-            status="queued",
-            prompt=prompt,
-            server_url=None,
-            xpra_url=None,
+        run_values.append(
+            {
+                "test_case_id": test_case.id,
+                "model_config_id": model_config_id,
+                "status": "queued",
+                "prompt": prompt,
+                "server_url": None,
+                "xpra_url": None,
+                "log": [build_run_log_entry("Queued for execution", "info")],
+            }
         )
-        session.add(run)
-        created_runs.append(run)
 
+    result = await session.scalars(
+        insert(TestRun).returning(TestRun, sort_by_parameter_order=True), run_values
+    )
+    created_runs = list(result.all())
     await session.commit()
 
-    for run in created_runs:
-        await session.refresh(run)
-        await append_run_log_entry(session, run, "Queued for execution", "info")
-        await run_queue.put(run.id)
+    await enqueue_test_runs([run.id for run in created_runs])
 
     return [test_run_to_read(run) for run in created_runs]
 
 
-@router.get("/test-runs", response_model=List[TestRunRead])
-async def list_test_runs(session: AsyncSession = Depends(get_db)):
-    result = await session.execute(select(TestRun).order_by(TestRun.created_at.desc()))
-    runs = result.scalars().all()
-    return [test_run_to_read(run) for run in runs]
+@router.get(
+    "/test-runs",
+    response_model=None,
+    responses={200: {"model": List[Union[TestRunRead, TestRunSummary]]}},
+)
+async def list_test_runs(
+    include_log: bool = Query(True), session: AsyncSession = Depends(get_db)
+) -> ModelListStreamingResponse:
+    statement = (
+        select(TestRun)
+        .order_by(TestRun.created_at.desc())
+        .execution_options(yield_per=_TEST_RUN_STREAM_BATCH)
+    )
+    if include_log:
+        adapter, to_dict = _TEST_RUN_LIST, test_run_to_dict
+    else:
+        statement = statement.options(defer(TestRun.log), defer(TestRun.prompt))
+        adapter, to_dict = _TEST_RUN_SUMMARY_LIST, test_run_to_summary_dict
+
+    # The ``get_db`` session stays open until the response has been sent.
+    result = await session.stream_scalars(statement)
+    batches = ([to_dict(run) for run in runs] async for runs in result.partitions())
+    return await ModelListStreamingResponse.from_batches(adapter, batches)
 
 
 @router.get("/test-runs/{run_id}", response_model=TestRunRead)
@@ -114,8 +145,4 @@ async def get_test_run(run_id: int, session: AsyncSession = Depends(get_db)):
 
 @router.get("/quality-insights", response_model=QualityInsightsResponse)
 async def get_quality_insights(session: AsyncSession = Depends(get_db)):
-    cases_result = await session.execute(select(TestCase))
-    cases = cases_result.scalars().all()
-    runs_result = await session.execute(select(TestRun))
-    runs = runs_result.scalars().all()
-    return compute_quality_insights(cases, runs)
+    return await compute_quality_insights(session)
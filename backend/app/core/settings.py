@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import os
-from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
 
@@ -22,7 +22,37 @@ if DATABASE_URL is None:
     DATABASE_URL = f"sqlite+aiosqlite:///{_DEFAULT_DB_PATH}"
 
 
-@lru_cache(maxsize=1)
+REDIS_POOL_MAX = int(os.getenv("REDIS_POOL_MAX", "64"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "20"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+_redis_client: Optional["redis.Redis"] = None
+
+
 def get_redis_client() -> "redis.Redis":
+    global _redis_client
+    if _redis_client is not None:
+        return _redis_client
     redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
-    return redis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+    # An explicit pool keeps bursts of concurrent tasks reusing connections
+    # instead of opening new ones, and caps how many a replica can hold.
+    # Callers beyond the cap wait up to ``REDIS_POOL_TIMEOUT`` seconds for a
+    # free connection and then get a ``ConnectionError``.
+    pool = redis.BlockingConnectionPool.from_url(
+        redis_url,
+        encoding="utf-8",
+        decode_responses=True,
+        max_connections=REDIS_POOL_MAX,
+        timeout=REDIS_POOL_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+    _redis_client = redis.Redis(connection_pool=pool)
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the shared client's connections; the pool reconnects if reused."""
+    if _redis_client is None:
+        return
+    await _redis_client.aclose()
+    await _redis_client.connection_pool.disconnect()
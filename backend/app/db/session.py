@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-from typing import AsyncIterator
+from typing import Any, AsyncIterator
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from ..core.settings import DATABASE_URL
 from .base import Base
 
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+
+def _serialise_json(value: Any) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    json_serializer=_serialise_json,
+    json_deserializer=orjson.loads,
+)
 AsyncSessionLocal = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
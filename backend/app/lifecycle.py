@@ -4,12 +4,16 @@ import os
 
 from fastapi import FastAPI
 
+from backend.mcp import close_agent_clients
+
+from .core.settings import close_redis_client
+from .services.session_pool import SESSION_POOL
 from .services.test_runs import (
     ensure_default_records,
     initialise_database,
     resume_queued_runs,
-    start_worker_pool,
-    stop_worker_pool,
+    start_run_dispatcher,
+    stop_run_dispatcher,
 )
 
 
@@ -19,9 +23,21 @@ def register_events(app: FastAPI) -> None:
         await initialise_database()
         await ensure_default_records()
         await resume_queued_runs()
-        worker_count = int(os.getenv("TEST_RUN_WORKERS", "2"))
-        await start_worker_pool(worker_count)
+        # Default to one run per MCP session: extra runs would only sit in
+        # ``pending`` holding a database session while they wait for one.
+        # The limit is per process and SESSION_POOL is not coordinated
+        # between replicas, so only one replica may own a given session pool;
+        # extra replicas sharing the queue need their own MCP endpoints.
+        max_inflight = int(
+            os.getenv(
+                "TEST_RUN_MAX_INFLIGHT",
+                os.getenv("TEST_RUN_WORKERS", str(SESSION_POOL.size)),
+            )
+        )
+        await start_run_dispatcher(max_inflight)
 
     @app.on_event("shutdown")
     async def _on_shutdown() -> None:
-        await stop_worker_pool()
+        await stop_run_dispatcher()
+        await close_agent_clients()
+        await close_redis_client()
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
 
 from ..db.base import Base
 
@@ -23,3 +24,9 @@ class TestCase(Base):
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+
+    runs = relationship(
+        "TestRun", back_populates="test_case", lazy="raise", passive_deletes=True
+    )
+
+    __table_args__ = (Index("ix_test_cases_created", created_at.desc()),)
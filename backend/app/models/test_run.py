@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
 
 from ..db.base import Base
 
@@ -19,11 +20,18 @@ class TestRun(Base):
     server_url = Column(String(255), nullable=True)
     xpra_url = Column(String(255), nullable=True)
     task_id = Column(String(64), nullable=True)
-    log = Column(Text, nullable=False, default="[]")
-    metrics = Column(Text, nullable=False, default="{}")
+    log = Column(JSON, nullable=False, default=list)
+    metrics = Column(JSON, nullable=False, default=dict)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
+
+    test_case = relationship("TestCase", back_populates="runs", lazy="raise")
+
+    __table_args__ = (
+        Index("ix_test_runs_status_created", status, created_at.desc()),
+        Index("ix_test_runs_created", created_at.desc()),
+    )
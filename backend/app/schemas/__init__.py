@@ -13,6 +13,7 @@ from .test_run import (
     TestRunLogEntry,
     TestRunRead,
     TestRunRequest,
+    TestRunSummary,
 )
 
 __all__ = [
@@ -35,4 +36,5 @@ __all__ = [
     "TestRunLogEntry",
     "TestRunRead",
     "TestRunRequest",
+    "TestRunSummary",
 ]
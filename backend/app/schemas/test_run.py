@@ -3,7 +3,13 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationError,
+    ValidatorFunctionWrapHandler,
+    field_validator,
+)
 
 from .model_config import ModelConfigCreate
 
@@ -13,18 +19,30 @@ class TestRunLogEntry(BaseModel):
     type: str
     message: str
 
+    @field_validator("timestamp", mode="wrap")
+    @classmethod
+    def _fallback_timestamp(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler
+    ) -> datetime:
+        # Stored entries keep their ISO string so pydantic-core parses it; a
+        # missing or malformed value is stamped with the current time instead.
+        if not value:
+            return datetime.utcnow()
+        try:
+            return handler(value)
+        except ValidationError:
+            return datetime.utcnow()
 
-class TestRunRead(BaseModel):
+
+class TestRunSummary(BaseModel):
     id: int
     test_case_id: int
     model_config_id: Optional[int]
     status: str
     result: Optional[str]
-    prompt: str
     server_url: Optional[str]
     xpra_url: Optional[str]
     task_id: Optional[str]
-    log: List[TestRunLogEntry]
     metrics: Dict[str, Any]
     created_at: datetime
     updated_at: datetime
@@ -32,6 +50,11 @@ class TestRunRead(BaseModel):
     completed_at: Optional[datetime]
 
 
+class TestRunRead(TestRunSummary):
+    prompt: str
+    log: List[TestRunLogEntry]
+
+
 class TestRunRequest(BaseModel):
     test_case_ids: List[int] = Field(..., min_items=1)
     model_config_id: Optional[int] = None
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any, Dict, List
 
 from ..models import LLMModel, ModelConfig, PromptTemplate, TestCase, TestRun
@@ -9,10 +8,9 @@ from ..schemas import (
     ModelConfigRead,
     PromptTemplateRead,
     TestCaseRead,
-    TestRunLogEntry,
     TestRunRead,
 )
-from ..utils.json import load_dict, load_json_list, load_string_list
+from ..utils.json import load_dict, load_string_list
 
 
 def mask_api_key(value: str) -> str:
@@ -35,32 +33,40 @@ def prompt_to_read(template: PromptTemplate) -> PromptTemplateRead:
     )
 
 
+def model_config_to_dict(config: ModelConfig) -> Dict[str, Any]:
+    return {
+        "id": config.id,
+        "name": config.name,
+        "provider": config.provider,
+        "description": config.description,
+        "parameters": load_dict(config.parameters),
+        "created_at": config.created_at,
+        "updated_at": config.updated_at,
+    }
+
+
 def model_config_to_read(config: ModelConfig) -> ModelConfigRead:
-    return ModelConfigRead(
-        id=config.id,
-        name=config.name,
-        provider=config.provider,
-        description=config.description,
-        parameters=load_dict(config.parameters),
-        created_at=config.created_at,
-        updated_at=config.updated_at,
-    )
+    return ModelConfigRead.model_validate(model_config_to_dict(config))
+
+
+def test_case_to_dict(case: TestCase) -> Dict[str, Any]:
+    return {
+        "id": case.id,
+        "reference": case.reference,
+        "title": case.title,
+        "description": case.description,
+        "category": case.category,
+        "priority": case.priority,
+        "status": case.status,
+        "tags": load_string_list(case.tags),
+        "steps": load_string_list(case.steps),
+        "created_at": case.created_at,
+        "updated_at": case.updated_at,
+    }
 
 
 def test_case_to_read(case: TestCase) -> TestCaseRead:
-    return TestCaseRead(
-        id=case.id,
-        reference=case.reference,
-        title=case.title,
-        description=case.description,
-        category=case.category,
-        priority=case.priority,
-        status=case.status,
-        tags=load_string_list(case.tags),
-        steps=load_string_list(case.steps),
-        created_at=case.created_at,
-        updated_at=case.updated_at,
-    )
+    return TestCaseRead.model_validate(test_case_to_dict(case))
 
 
 def llm_model_to_read(model: LLMModel) -> LLMModelRead:
@@ -77,40 +83,45 @@ def llm_model_to_read(model: LLMModel) -> LLMModelRead:
     )
 
 
-def test_run_to_read(run: TestRun) -> TestRunRead:
-    logs_raw = load_json_list(run.log)
-    log_entries: List[TestRunLogEntry] = []
+def _run_log_entries(run: TestRun) -> List[Dict[str, Any]]:
+    logs_raw = run.log if isinstance(run.log, list) else []
+    log_entries: List[Dict[str, Any]] = []
     for entry in logs_raw:
         if isinstance(entry, dict):
-            timestamp = entry.get("timestamp")
-            try:
-                parsed_timestamp = (
-                    datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow()
-                )
-            except ValueError:
-                parsed_timestamp = datetime.utcnow()
             log_entries.append(
-                TestRunLogEntry(
-                    timestamp=parsed_timestamp,
-                    type=str(entry.get("type", "info")),
-                    message=str(entry.get("message", "")),
-                )
+                {
+                    "timestamp": entry.get("timestamp"),
+                    "type": str(entry.get("type", "info")),
+                    "message": str(entry.get("message", "")),
+                }
             )
-    metrics = load_dict(run.metrics)
-    return TestRunRead(
-        id=run.id,
-        test_case_id=run.test_case_id,
-        model_config_id=run.model_config_id,
-        status=run.status,
-        result=run.result,
-        prompt=run.prompt,
-        server_url=run.server_url,
-        xpra_url=run.xpra_url,
-        task_id=run.task_id,
-        log=log_entries,
-        metrics=metrics,
-        created_at=run.created_at,
-        updated_at=run.updated_at,
-        started_at=run.started_at,
-        completed_at=run.completed_at,
-    )
+    return log_entries
+
+
+def test_run_to_summary_dict(run: TestRun) -> Dict[str, Any]:
+    return {
+        "id": run.id,
+        "test_case_id": run.test_case_id,
+        "model_config_id": run.model_config_id,
+        "status": run.status,
+        "result": run.result,
+        "server_url": run.server_url,
+        "xpra_url": run.xpra_url,
+        "task_id": run.task_id,
+        "metrics": run.metrics if isinstance(run.metrics, dict) else {},
+        "created_at": run.created_at,
+        "updated_at": run.updated_at,
+        "started_at": run.started_at,
+        "completed_at": run.completed_at,
+    }
+
+
+def test_run_to_dict(run: TestRun) -> Dict[str, Any]:
+    values = test_run_to_summary_dict(run)
+    values["prompt"] = run.prompt
+    values["log"] = _run_log_entries(run)
+    return values
+
+
+def test_run_to_read(run: TestRun) -> TestRunRead:
+    return TestRunRead.model_validate(test_run_to_dict(run))
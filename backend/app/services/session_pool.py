@@ -16,10 +16,15 @@ class SessionDefinition:
 class SessionPool:
     def __init__(self, sessions: List[SessionDefinition]):
         self._available: List[SessionDefinition] = list(sessions)
+        self._size = len(self._available)
         self._in_use: Dict[str, SessionDefinition] = {}
         self._waiters: deque[asyncio.Future[SessionDefinition]] = deque()
         self._lock = asyncio.Lock()
 
+    @property
+    def size(self) -> int:
+        return self._size
+
     async def acquire_nowait(self) -> Optional[SessionDefinition]:
         async with self._lock:
             if self._available:
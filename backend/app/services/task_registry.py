@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from datetime import datetime
+import gzip
+import os
+import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
+import orjson
 from fastapi import HTTPException
-from redis.exceptions import RedisError
+from redis.exceptions import RedisError, ResponseError
 
 from ..core.settings import LOG_DIR, get_redis_client
 
@@ -21,6 +24,21 @@ async def safe_redis_call(coro):
         raise RuntimeError(f"Redis operation failed: {exc}") from exc
 
 
+TASK_BUCKETS = ("active", "pending", "completed", "failed", "cancelled")
+
+
+def _bucket_for_status(status: str) -> str:
+    if status == "running":
+        return "tasks:active"
+    return f"tasks:{status}"
+
+
+def _queue_status_move(pipe: Any, task_id: str, status: str) -> None:
+    for bucket in TASK_BUCKETS:
+        pipe.srem(f"tasks:{bucket}", task_id)
+    pipe.sadd(_bucket_for_status(status), task_id)
+
+
 async def register_task(
     task_id: str,
     task_text: str,
@@ -43,95 +61,229 @@ async def register_task(
     if xpra_url:
         mapping["xpra_url"] = xpra_url
 
-    await safe_redis_call(
-        redis_client.hset(
-            f"task:{task_id}",
-            mapping=mapping,
-        )
-    )
-    await safe_redis_call(redis_client.sadd("tasks:all", task_id))
-    if status == "running":
-        await safe_redis_call(redis_client.sadd("tasks:active", task_id))
-    elif status == "pending":
-        await safe_redis_call(redis_client.sadd("tasks:pending", task_id))
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hset(f"task:{task_id}", mapping=mapping)
+        pipe.sadd("tasks:all", task_id)
+        if status in {"running", "pending"}:
+            pipe.sadd(_bucket_for_status(status), task_id)
+        await safe_redis_call(pipe.execute())
 
 
 async def update_task_metadata(task_id: str, mapping: Dict[str, Any]) -> None:
-    status = mapping.get("status")
-    if status is not None:
-        for bucket in ["active", "pending", "completed", "failed", "cancelled"]:
-            await safe_redis_call(redis_client.srem(f"tasks:{bucket}", task_id))
-        if status == "running":
-            await safe_redis_call(redis_client.sadd("tasks:active", task_id))
-        elif status == "pending":
-            await safe_redis_call(redis_client.sadd("tasks:pending", task_id))
-        else:
-            await safe_redis_call(redis_client.sadd(f"tasks:{status}", task_id))
-
-    await safe_redis_call(
-        redis_client.hset(
+    async with redis_client.pipeline(transaction=False) as pipe:
+        status = mapping.get("status")
+        if status is not None:
+            _queue_status_move(pipe, task_id, status)
+        pipe.hset(
             f"task:{task_id}",
-            mapping={**mapping, "updated_at": datetime.utcnow().isoformat()},
+            mapping={"updated_at": datetime.utcnow().isoformat(), **mapping},
         )
-    )
+        await safe_redis_call(pipe.execute())
+
+
+def _is_wrong_type(result: Any) -> bool:
+    return isinstance(result, ResponseError) and str(result).startswith("WRONGTYPE")
+
+
+def _raise_pipeline_errors(results: Sequence[Any]) -> None:
+    for result in results:
+        if isinstance(result, ResponseError) and not _is_wrong_type(result):
+            raise RuntimeError(f"Redis operation failed: {result}") from result
+
+
+async def append_task_log_entries(task_id: str, payloads: Sequence[str]) -> None:
+    if not payloads:
+        return
+    key = f"task:{task_id}:log"
+    async with redis_client.pipeline(transaction=False) as pipe:
+        # Entry ids are assigned by Redis and double as the entry timestamps;
+        # the newest one also stands in for ``updated_at`` on read, so the
+        # task hash is not rewritten for every batch.
+        for payload in payloads:
+            pipe.xadd(key, {"payload": payload})
+        results = await safe_redis_call(pipe.execute(raise_on_error=False))
+    _raise_pipeline_errors(results)
+    if any(_is_wrong_type(result) for result in results):
+        # A task that started before the move to streams still owns a list;
+        # keep appending JSON envelopes to it so its log stays in one place.
+        # Its updated_at cannot be derived from entry ids, so it is stored.
+        timestamp = datetime.utcnow().isoformat()
+        envelopes = [
+            orjson.dumps({"timestamp": timestamp, "payload": payload}).decode()
+            for payload in payloads
+        ]
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.rpush(key, *envelopes)
+            pipe.hset(f"task:{task_id}", "updated_at", timestamp)
+            await safe_redis_call(pipe.execute())
 
 
 async def append_task_log(task_id: str, payload: str) -> None:
-    entry = json.dumps({"timestamp": datetime.utcnow().isoformat(), "payload": payload})
-    await safe_redis_call(redis_client.rpush(f"task:{task_id}:log", entry))
-    await update_task_metadata(task_id, {})
+    await append_task_log_entries(task_id, [payload])
 
 
 async def finalize_task(task_id: str, status: str) -> None:
     timestamp = datetime.utcnow().isoformat()
-    await safe_redis_call(redis_client.srem("tasks:active", task_id))
-    await safe_redis_call(redis_client.srem("tasks:pending", task_id))
-    await safe_redis_call(redis_client.srem("tasks:completed", task_id))
-    await safe_redis_call(redis_client.srem("tasks:failed", task_id))
-    await safe_redis_call(redis_client.srem("tasks:cancelled", task_id))
-    await safe_redis_call(redis_client.sadd(f"tasks:{status}", task_id))
-    await safe_redis_call(
-        redis_client.hset(
+    async with redis_client.pipeline(transaction=False) as pipe:
+        _queue_status_move(pipe, task_id, status)
+        pipe.hset(
             f"task:{task_id}",
             mapping={"status": status, "completed_at": timestamp, "updated_at": timestamp},
         )
-    )
+        await safe_redis_call(pipe.execute())
+
+
+def _queue_task_read(pipe: Any, task_id: str) -> None:
+    pipe.hgetall(f"task:{task_id}")
+    pipe.xrevrange(f"task:{task_id}:log", count=1)
+
+
+def _with_log_activity(data: Dict[str, str], latest_entry_id: Optional[str]) -> None:
+    # Log appends leave the hash alone; a newer log entry means a later update.
+    if latest_entry_id:
+        logged_at = _stream_id_to_iso(latest_entry_id)
+        if logged_at > data.get("updated_at", ""):
+            data["updated_at"] = logged_at
+
+
+def _task_from_reply(task_id: str, data: Any, latest: Any) -> Optional[Dict[str, str]]:
+    """Build task metadata from the replies queued by ``_queue_task_read``."""
+    _raise_pipeline_errors([data, latest])
+    if not isinstance(data, dict) or not data:
+        return None
+    data["task_id"] = task_id
+    # Legacy list logs answer XREVRANGE with WRONGTYPE and keep their stored value.
+    if isinstance(latest, list) and latest:
+        _with_log_activity(data, latest[0][0])
+    return data
 
 
 async def get_task_metadata(task_id: str) -> Dict[str, str]:
-    data = await safe_redis_call(redis_client.hgetall(f"task:{task_id}"))
-    if not data:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        _queue_task_read(pipe, task_id)
+        data = _task_from_reply(
+            task_id, *await safe_redis_call(pipe.execute(raise_on_error=False))
+        )
+    if data is None:
         raise HTTPException(status_code=404, detail="Task not found.")
-    data["task_id"] = task_id
     return data
 
 
+def _stream_id_to_iso(entry_id: str) -> str:
+    milliseconds = int(entry_id.split("-", 1)[0])
+    stamp = datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
+    return stamp.replace(tzinfo=None).isoformat()
+
+
+def _legacy_log_record(entry: str) -> Tuple[Optional[str], Any]:
+    try:
+        envelope = orjson.loads(entry)
+    except orjson.JSONDecodeError:
+        return None, entry
+    if not isinstance(envelope, dict):
+        return None, entry
+    return envelope.get("timestamp"), envelope.get("payload", "")
+
+
+TASK_LOG_READ_CHUNK = 1000
+
+
+async def _iter_log_chunks(task_id: str) -> AsyncIterator[List[Tuple[Optional[str], Any]]]:
+    """Yield a task's log records in chunks of at most ``TASK_LOG_READ_CHUNK``."""
+    key = f"task:{task_id}:log"
+    chunk_size = TASK_LOG_READ_CHUNK
+    # The first chunk of both read variants rides along with TYPE; the one
+    # that does not match the key fails with WRONGTYPE and is ignored.
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.type(key)
+        pipe.xrange(key, count=chunk_size)
+        pipe.lrange(key, 0, chunk_size - 1)
+        results = await safe_redis_call(pipe.execute(raise_on_error=False))
+    _raise_pipeline_errors(results)
+    key_type, entries, legacy_entries = results
+
+    if key_type == "list":
+        # Tasks logged before the move to streams keep their JSON-in-list log.
+        start = 0
+        while legacy_entries:
+            yield [_legacy_log_record(entry) for entry in legacy_entries]
+            if len(legacy_entries) < chunk_size:
+                return
+            start += chunk_size
+            legacy_entries = await safe_redis_call(
+                redis_client.lrange(key, start, start + chunk_size - 1)
+            )
+        return
+
+    while entries:
+        yield [
+            (_stream_id_to_iso(entry_id), fields.get("payload", ""))
+            for entry_id, fields in entries
+        ]
+        if len(entries) < chunk_size:
+            return
+        entries = await safe_redis_call(
+            redis_client.xrange(key, min=f"({entries[-1][0]}", count=chunk_size)
+        )
+
+
+async def _read_log_records(task_id: str) -> List[Tuple[Optional[str], Any]]:
+    records: List[Tuple[Optional[str], Any]] = []
+    async for chunk in _iter_log_chunks(task_id):
+        records.extend(chunk)
+    return records
+
+
+def _format_log_lines(records: Sequence[Tuple[Optional[str], Any]]) -> bytes:
+    lines = [
+        f"{message}\n" if timestamp is None else f"[{timestamp}] {message}\n"
+        for timestamp, message in records
+    ]
+    return "".join(lines).encode("utf-8")
+
+
+TASK_LOG_GZIP_LEVEL = 6
+
+
 async def ensure_log_directory() -> None:
     await asyncio.to_thread(LOG_DIR.mkdir, parents=True, exist_ok=True)
 
 
+def _create_temp_log_path(task_id: str) -> Path:
+    handle, name = tempfile.mkstemp(dir=LOG_DIR, prefix=f".{task_id}.", suffix=".tmp")
+    os.close(handle)
+    return Path(name)
+
+
 async def persist_log_file(task_id: str) -> Path:
     await ensure_log_directory()
-    entries: List[str] = await safe_redis_call(redis_client.lrange(f"task:{task_id}:log", 0, -1))
-    if not entries:
+    chunks = _iter_log_chunks(task_id)
+    first = await anext(chunks, None)
+    if not first:
         raise HTTPException(status_code=404, detail="No log entries for this task.")
 
-    log_path = LOG_DIR / f"{task_id}.txt"
-
-    def _write_file() -> None:
-        with log_path.open("w", encoding="utf-8") as file:
-            for entry in entries:
-                try:
-                    payload = json.loads(entry)
-                except json.JSONDecodeError:
-                    file.write(f"{entry}\n")
-                    continue
+    log_path = LOG_DIR / f"{task_id}.txt.gz"
 
-                timestamp = payload.get("timestamp", "")
-                message = payload.get("payload", "")
-                file.write(f"[{timestamp}] {message}\n")
-
-    await asyncio.to_thread(_write_file)
+    # Only one chunk is held in memory at a time, however long the log is.
+    # Logs compress well and are written once, so they are stored gzipped and
+    # served as-is to clients that accept gzip. The file is written under a
+    # temporary name and renamed into place, so concurrent writers never
+    # interleave and readers never see a partial archive.
+    temp_path = await asyncio.to_thread(_create_temp_log_path, task_id)
+    try:
+        file = await asyncio.to_thread(
+            gzip.open, temp_path, "wb", compresslevel=TASK_LOG_GZIP_LEVEL
+        )
+        try:
+            await asyncio.to_thread(file.write, _format_log_lines(first))
+            async for chunk in chunks:
+                await asyncio.to_thread(file.write, _format_log_lines(chunk))
+        finally:
+            await asyncio.to_thread(file.close)
+        await asyncio.to_thread(os.replace, temp_path, log_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
 
     await safe_redis_call(
         redis_client.hset(
@@ -144,42 +296,97 @@ async def persist_log_file(task_id: str) -> Path:
 
 
 async def get_or_create_log_file(task_id: str) -> Path:
-    metadata = await get_task_metadata(task_id)
-    existing = metadata.get("log_file")
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.exists(f"task:{task_id}")
+        pipe.hget(f"task:{task_id}", "log_file")
+        found, existing = await safe_redis_call(pipe.execute())
+    if not found:
+        raise HTTPException(status_code=404, detail="Task not found.")
     if existing:
         path = Path(existing)
-        if path.exists():
+        if await asyncio.to_thread(path.exists):
             return path
     return await persist_log_file(task_id)
 
 
+TASK_SCAN_COUNT = 500
+
+# For every set in KEYS, scans one page from the cursor in the matching ARGV
+# slot (the last ARGV is the page size) and returns {next_cursor, tasks}, where
+# tasks is a flat array of (task id, HGETALL reply, newest log entry id or nil)
+# triples.
+# Paging bounds how long each call holds Redis; small sets finish in one call.
+_SCAN_TASK_SETS = redis_client.register_script(
+    """
+local count = ARGV[#KEYS + 1]
+local out = {}
+for i, set_name in ipairs(KEYS) do
+    local page = redis.call('SSCAN', set_name, ARGV[i], 'COUNT', count)
+    local tasks = {}
+    for _, task_id in ipairs(page[2]) do
+        tasks[#tasks + 1] = task_id
+        tasks[#tasks + 1] = redis.call('HGETALL', 'task:' .. task_id)
+        local latest = redis.pcall(
+            'XREVRANGE', 'task:' .. task_id .. ':log', '+', '-', 'COUNT', 1
+        )
+        local latest_id = false
+        if latest.err == nil and latest[1] ~= nil then
+            latest_id = latest[1][1]
+        end
+        tasks[#tasks + 1] = latest_id
+    end
+    out[i] = {page[1], tasks}
+end
+return out
+"""
+)
+
+
+def _collect_tasks(reply: Sequence[Any], into: Dict[str, Dict[str, str]]) -> None:
+    # SSCAN may repeat ids across pages, so results are keyed by task id.
+    for task_id, fields, latest_entry_id in zip(reply[::3], reply[1::3], reply[2::3]):
+        if fields:
+            data = dict(zip(fields[::2], fields[1::2]))
+            data["task_id"] = task_id
+            _with_log_activity(data, latest_entry_id)
+            into[task_id] = data
+
+
+def _sorted_tasks(tasks: Dict[str, Dict[str, str]]) -> List[Dict[str, str]]:
+    return sorted(tasks.values(), key=lambda item: item.get("created_at", ""), reverse=True)
+
+
+async def fetch_task_lists(set_names: Sequence[str]) -> Dict[str, List[Dict[str, str]]]:
+    """Fetch the metadata of every task in each set, newest first."""
+    tasks: Dict[str, Dict[str, Dict[str, str]]] = {name: {} for name in set_names}
+    cursors = {name: "0" for name in set_names}
+    pending = list(set_names)
+    while pending:
+        replies = await safe_redis_call(
+            _SCAN_TASK_SETS(
+                keys=pending, args=[*(cursors[name] for name in pending), TASK_SCAN_COUNT]
+            )
+        )
+        unfinished = []
+        for set_name, (cursor, reply) in zip(pending, replies):
+            _collect_tasks(reply, tasks[set_name])
+            if str(cursor) != "0":
+                cursors[set_name] = cursor
+                unfinished.append(set_name)
+        pending = unfinished
+    return {set_name: _sorted_tasks(tasks[set_name]) for set_name in set_names}
+
+
 async def fetch_task_list(set_name: str) -> List[Dict[str, str]]:
-    task_ids = await safe_redis_call(redis_client.smembers(set_name))
-    results: List[Dict[str, str]] = []
-    for task_id in task_ids:
-        try:
-            results.append(await get_task_metadata(task_id))
-        except HTTPException:
-            continue
-    results.sort(key=lambda item: item.get("created_at", ""), reverse=True)
-    return results
+    return (await fetch_task_lists([set_name]))[set_name]
 
 
 async def get_task_log_entries(task_id: str) -> List[Dict[str, object]]:
-    entries = await safe_redis_call(redis_client.lrange(f"task:{task_id}:log", 0, -1))
     parsed: List[Dict[str, object]] = []
-    for entry in entries:
+    for timestamp, raw_message in await _read_log_records(task_id):
         try:
-            payload = json.loads(entry)
-        except json.JSONDecodeError:
-            parsed.append({"timestamp": None, "payload": entry})
-            continue
-
-        timestamp = payload.get("timestamp")
-        raw_message = payload.get("payload")
-        try:
-            decoded = json.loads(raw_message) if isinstance(raw_message, str) else raw_message
-        except json.JSONDecodeError:
+            decoded = orjson.loads(raw_message) if isinstance(raw_message, str) else raw_message
+        except orjson.JSONDecodeError:
             decoded = raw_message
 
         parsed.append({"timestamp": timestamp, "payload": decoded})
@@ -187,6 +394,36 @@ async def get_task_log_entries(task_id: str) -> List[Dict[str, object]]:
     return parsed
 
 
+def _queue_log_length(pipe: Any, task_id: str) -> None:
+    # Queues TYPE plus both length commands; ``_log_length`` picks the one
+    # matching the key and ignores the other's WRONGTYPE error.
+    key = f"task:{task_id}:log"
+    pipe.type(key)
+    pipe.xlen(key)
+    pipe.llen(key)
+
+
+def _log_length(results: Sequence[Any]) -> int:
+    _raise_pipeline_errors(results)
+    key_type, length, legacy_length = results
+    return int((legacy_length if key_type == "list" else length) or 0)
+
+
 async def get_task_log_length(task_id: str) -> int:
-    length = await safe_redis_call(redis_client.llen(f"task:{task_id}:log"))
-    return int(length or 0)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        _queue_log_length(pipe, task_id)
+        results = await safe_redis_call(pipe.execute(raise_on_error=False))
+    return _log_length(results)
+
+
+async def get_task_summary(task_id: str) -> Dict[str, Any]:
+    """``get_task_metadata`` plus the task's ``log_length``, in one round-trip."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        _queue_task_read(pipe, task_id)
+        _queue_log_length(pipe, task_id)
+        data, latest, *results = await safe_redis_call(pipe.execute(raise_on_error=False))
+    metadata = _task_from_reply(task_id, data, latest)
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Task not found.")
+    summary: Dict[str, Any] = {**metadata, "log_length": _log_length(results)}
+    return summary
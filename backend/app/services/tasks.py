@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import gzip
+import logging
+import os
 import uuid
+from collections import deque
 from contextlib import suppress
-from typing import Any, AsyncIterator, Dict, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Set, Tuple
 
 from fastapi import HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 
-from backend.mcp import stream_agent_events
+from backend.mcp import is_progress_event, stream_agent_events
 
 from ..db.session import AsyncSessionLocal
 from ..models import TestCase, TestRun
@@ -19,19 +24,37 @@ from ..services.prompts import render_task_prompt
 from ..services.session_pool import SESSION_POOL, SessionDefinition
 from ..services.task_registry import (
     append_task_log,
-    fetch_task_list,
+    append_task_log_entries,
+    fetch_task_lists,
     finalize_task,
     get_or_create_log_file,
     get_task_log_entries,
     get_task_metadata,
-    get_task_log_length,
+    get_task_summary,
     persist_log_file,
     register_task,
     update_task_metadata,
 )
 from ..services.test_runs import append_run_log_entry, log_manual_run, update_manual_run
 from ..services.vector_memory import append_memory_to_text, fetch_relevant_memory
-from ..utils.json import dump_list, load_string_list
+from ..utils.json import dump_dict, dump_list, load_string_list, parse_event_payload
+
+logger = logging.getLogger(__name__)
+
+TASK_QUEUE_MAX = int(os.getenv("TASK_QUEUE_MAX", "256"))
+
+# Frames published within the window are sent as one write of at most
+# ``TASK_SSE_MAX_WRITE`` bytes (a single larger frame still goes out whole).
+TASK_SSE_COALESCE_WINDOW = 0.002
+TASK_SSE_MAX_WRITE = 16 * 1024
+
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+
+
+def _sse_frame(message: str) -> bytes:
+    return b"".join((_SSE_PREFIX, message.encode("utf-8"), _SSE_SUFFIX))
 
 
 class ManagedTask:
@@ -49,7 +72,15 @@ class ManagedTask:
         self.base_task_text = base_task_text or task_text
         self.prompt_template = prompt_template
         self.llm_settings = llm_settings
-        self.queue: asyncio.Queue[str | None] = asyncio.Queue()
+        # Progress events may be evicted for a slow client; control frames
+        # (session, status, result) never are. Both carry a publish sequence
+        # number so they are sent in the order they were published.
+        self.frames: Deque[Tuple[int, str]] = deque(maxlen=TASK_QUEUE_MAX)
+        self.control_frames: Deque[Tuple[int, str]] = deque()
+        self.frame_seq = 0
+        self.frames_ready = asyncio.Event()
+        self.stream_closed = False
+        self.detached = False
         self.task: asyncio.Task | None = None
         self.waiter: asyncio.Task | None = None
         self.done = asyncio.Event()
@@ -66,6 +97,114 @@ class ManagedTask:
 
 _tasks: Dict[str, ManagedTask] = {}
 _tasks_lock = asyncio.Lock()
+# Background log-file writes, referenced until done so they are not collected.
+_log_persists: Set[asyncio.Task[None]] = set()
+
+TASK_LOG_BATCH_SIZE = 64
+TASK_LOG_BATCH_WINDOW = 0.005
+# Payloads waiting for the log writer. When Redis falls behind the agent, the
+# agent waits for room instead of the backlog growing without bound.
+TASK_LOG_QUEUE_MAX = 1024
+
+
+def _publish(managed_task: ManagedTask, message: str | None) -> None:
+    """Hand ``message`` to the task's SSE stream; ``None`` ends the stream.
+
+    Agent progress events are buffered up to ``TASK_QUEUE_MAX``, evicting the
+    oldest, so a slow client never holds up the agent and only misses
+    intermediate progress. Control frames such as the session assignment and
+    the final status are kept until sent, and the end of the stream is a
+    flag. Once the stream has gone away, messages are dropped; they are still
+    in the task's Redis log.
+    """
+    if managed_task.detached:
+        return
+    if message is None:
+        managed_task.stream_closed = True
+    else:
+        managed_task.frame_seq += 1
+        frames = (
+            managed_task.frames
+            if is_progress_event(message)
+            else managed_task.control_frames
+        )
+        frames.append((managed_task.frame_seq, message))
+    managed_task.frames_ready.set()
+
+
+def _detach_stream(managed_task: ManagedTask) -> None:
+    managed_task.detached = True
+    managed_task.frames.clear()
+    managed_task.control_frames.clear()
+
+
+def _next_frame(managed_task: ManagedTask) -> Optional[str]:
+    frames, control = managed_task.frames, managed_task.control_frames
+    if control and (not frames or control[0][0] < frames[0][0]):
+        return control.popleft()[1]
+    if frames:
+        return frames.popleft()[1]
+    return None
+
+
+async def _stream_frames(managed_task: ManagedTask) -> AsyncIterator[bytes]:
+    """Yield the task's published frames as SSE bytes until the stream closes."""
+    while True:
+        await managed_task.frames_ready.wait()
+        if not managed_task.stream_closed:
+            # Let a burst of events land so they share one write.
+            await asyncio.sleep(TASK_SSE_COALESCE_WINDOW)
+        managed_task.frames_ready.clear()
+        buffer = bytearray()
+        while len(buffer) < TASK_SSE_MAX_WRITE:
+            message = _next_frame(managed_task)
+            if message is None:
+                break
+            buffer += _SSE_PREFIX
+            buffer += message.encode("utf-8")
+            buffer += _SSE_SUFFIX
+        pending = bool(managed_task.frames or managed_task.control_frames)
+        if pending:
+            managed_task.frames_ready.set()
+        if buffer:
+            yield bytes(buffer)
+        if managed_task.stream_closed and not pending:
+            return
+
+
+async def _log_batcher(task_id: str, queue: asyncio.Queue[str | None]) -> None:
+    """Write queued log payloads to Redis, one pipeline per batch.
+
+    A batch closes once ``TASK_LOG_BATCH_SIZE`` payloads are collected or no
+    new payload arrives within ``TASK_LOG_BATCH_WINDOW`` seconds. ``None``
+    stops the batcher after everything queued before it has been written.
+    """
+    closing = False
+    while not closing:
+        message = await queue.get()
+        if message is None:
+            return
+        batch = [message]
+        while len(batch) < TASK_LOG_BATCH_SIZE:
+            try:
+                message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    message = await asyncio.wait_for(queue.get(), TASK_LOG_BATCH_WINDOW)
+                except asyncio.TimeoutError:
+                    break
+            if message is None:
+                closing = True
+                break
+            batch.append(message)
+        try:
+            await append_task_log_entries(task_id, batch)
+        except RuntimeError as exc:
+            # The events were already published to live listeners; only the
+            # persisted log loses them, so keep the task running.
+            logger.warning(
+                "Dropped %d log entries for task %s: %s", len(batch), task_id, exc
+            )
 
 
 async def _activate_managed_task(
@@ -89,7 +228,7 @@ async def _activate_managed_task(
             "prompt": rendered_prompt,
         },
     )
-    session_payload = json.dumps(
+    session_payload = dump_dict(
         {
             "type": "session",
             "message": f"Assigned MCP session {allocation.identifier}",
@@ -108,7 +247,7 @@ async def _activate_managed_task(
             f"Assigned MCP session {allocation.identifier}",
             "info",
         )
-    await managed_task.queue.put(session_payload)
+    _publish(managed_task, session_payload)
     await append_task_log(task_id, session_payload)
     managed_task.task = asyncio.create_task(_agent_worker(task_id, managed_task))
 
@@ -129,10 +268,27 @@ async def _await_session(task_id: str, managed_task: ManagedTask) -> None:
     await _activate_managed_task(task_id, managed_task, allocation)
 
 
+async def _persist_log_quietly(task_id: str) -> None:
+    # Runs after the task has been cleaned up, so a failure is only logged;
+    # ``get_or_create_log_file`` rebuilds the file on demand.
+    try:
+        await persist_log_file(task_id)
+    except Exception:
+        logger.exception("Failed to persist the log file for task %s", task_id)
+
+
 async def _agent_worker(task_id: str, managed_task: ManagedTask) -> None:
     """Background worker that executes the MCP agent and streams output."""
 
     managed_task.status = "running"
+    log_queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=TASK_LOG_QUEUE_MAX)
+    log_writer = asyncio.create_task(_log_batcher(task_id, log_queue))
+
+    async def queue_log(payload: str | None) -> None:
+        # A writer that has stopped can no longer drain the queue.
+        if not log_writer.done():
+            await log_queue.put(payload)
+
     try:
         async for message in stream_agent_events(
             managed_task.task_text,
@@ -141,44 +297,45 @@ async def _agent_worker(task_id: str, managed_task: ManagedTask) -> None:
             managed_task.prompt_template,
             render_task_prompt,
         ):
-            await append_task_log(task_id, message)
-            await managed_task.queue.put(message)
+            await queue_log(message)
+            _publish(managed_task, message)
             if managed_task.run_id is not None:
-                try:
-                    payload = json.loads(message)
-                    msg_text = str(payload.get("message", ""))
-                    msg_type = str(payload.get("type", "info"))
-                except json.JSONDecodeError:
-                    msg_text = message
-                    msg_type = "info"
+                msg_type, msg_text = parse_event_payload(message)
                 await log_manual_run(managed_task.run_id, msg_text, msg_type)
     except asyncio.CancelledError:
         managed_task.status = "cancelled"
-        cancel_payload = json.dumps({"type": "cancelled", "message": "Task cancelled."})
-        await managed_task.queue.put(cancel_payload)
-        await append_task_log(task_id, cancel_payload)
+        cancel_payload = dump_dict({"type": "cancelled", "message": "Task cancelled."})
+        _publish(managed_task, cancel_payload)
+        await queue_log(cancel_payload)
         if managed_task.run_id is not None:
             await log_manual_run(managed_task.run_id, "Task cancelled.", "cancelled")
         raise
     except Exception as exc:  # pragma: no cover - defensive
         managed_task.status = "failed"
-        error_payload = json.dumps({"type": "error", "message": str(exc)})
-        await managed_task.queue.put(error_payload)
-        await append_task_log(task_id, error_payload)
+        error_payload = dump_dict({"type": "error", "message": str(exc)})
+        _publish(managed_task, error_payload)
+        await queue_log(error_payload)
         if managed_task.run_id is not None:
             await log_manual_run(managed_task.run_id, str(exc), "error")
     finally:
         if managed_task.status == "running":
             managed_task.status = "completed"
-        await managed_task.queue.put(None)
+        await queue_log(None)
+        try:
+            await log_writer
+        except Exception:
+            # The rest of the cleanup must still run, or listeners hang and
+            # the MCP session never returns to the pool.
+            logger.exception("Log writer for task %s failed", task_id)
+        _publish(managed_task, None)
         managed_task.done.set()
         try:
             await finalize_task(task_id, managed_task.status)
         except Exception as exc:  # pragma: no cover - defensive
-            error_payload = json.dumps(
+            error_payload = dump_dict(
                 {"type": "error", "message": f"Failed to finalize task: {exc}"}
             )
-            await managed_task.queue.put(error_payload)
+            _publish(managed_task, error_payload)
             if managed_task.run_id is not None:
                 await log_manual_run(
                     managed_task.run_id,
@@ -187,8 +344,9 @@ async def _agent_worker(task_id: str, managed_task: ManagedTask) -> None:
                 )
         else:
             if managed_task.status in {"completed", "failed", "cancelled"}:
-                with suppress(Exception):  # pragma: no cover - defensive
-                    await persist_log_file(task_id)
+                persist = asyncio.create_task(_persist_log_quietly(task_id))
+                _log_persists.add(persist)
+                persist.add_done_callback(_log_persists.discard)
             if managed_task.run_id is not None:
                 result_value = (
                     "success" if managed_task.status == "completed" else managed_task.status
@@ -298,8 +456,8 @@ async def run_task(request: TaskRequest) -> StreamingResponse:
                 server_url=None,
                 xpra_url=None,
                 task_id=task_id,
-                log="[]",
-                metrics="{}",
+                log=[],
+                metrics={},
             )
             session.add(run_record)
             await session.commit()
@@ -324,14 +482,14 @@ async def run_task(request: TaskRequest) -> StreamingResponse:
                 status="pending",
                 prompt=initial_prompt,
             )
-            waiting_payload = json.dumps(
+            waiting_payload = dump_dict(
                 {
                     "type": "info",
                     "message": "Waiting for available MCP session.",
                 }
             )
             await append_task_log(task_id, waiting_payload)
-            await managed_task.queue.put(waiting_payload)
+            _publish(managed_task, waiting_payload)
             if managed_task.run_id is not None:
                 await log_manual_run(
                     managed_task.run_id,
@@ -373,7 +531,7 @@ async def run_task(request: TaskRequest) -> StreamingResponse:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
     async def event_stream() -> AsyncIterator[bytes]:
-        initial_payload = json.dumps(
+        initial_payload = dump_dict(
             {
                 "type": "task",
                 "taskId": task_id,
@@ -387,16 +545,14 @@ async def run_task(request: TaskRequest) -> StreamingResponse:
         )
         with suppress(Exception):  # pragma: no cover - defensive
             await append_task_log(task_id, initial_payload)
-        yield f"data: {initial_payload}\n\n".encode("utf-8")
 
         try:
-            while True:
-                message = await managed_task.queue.get()
-                if message is None:
-                    break
-                yield f"data: {message}\n\n".encode("utf-8")
+            yield _sse_frame(initial_payload)
+            async for chunk in _stream_frames(managed_task):
+                yield chunk
         finally:
-            yield b"data: [DONE]\n\n"
+            _detach_stream(managed_task)
+            yield _SSE_DONE
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
@@ -415,10 +571,10 @@ async def cancel_task(task_id: str) -> Dict[str, str]:
             with suppress(asyncio.CancelledError):
                 await managed_task.waiter
             managed_task.waiter = None
-        cancel_payload = json.dumps({"type": "cancelled", "message": "Task cancelled."})
+        cancel_payload = dump_dict({"type": "cancelled", "message": "Task cancelled."})
         await append_task_log(task_id, cancel_payload)
-        await managed_task.queue.put(cancel_payload)
-        await managed_task.queue.put(None)
+        _publish(managed_task, cancel_payload)
+        _publish(managed_task, None)
         await finalize_task(task_id, "cancelled")
         async with _tasks_lock:
             _tasks.pop(task_id, None)
@@ -438,34 +594,21 @@ async def cancel_task(task_id: str) -> Dict[str, str]:
 
 
 async def list_tasks() -> Dict[str, Any]:
+    buckets = ["active", "pending", "completed", "cancelled", "failed"]
     try:
-        active = await fetch_task_list("tasks:active")
-        pending = await fetch_task_list("tasks:pending")
-        completed = await fetch_task_list("tasks:completed")
-        cancelled = await fetch_task_list("tasks:cancelled")
-        failed = await fetch_task_list("tasks:failed")
+        tasks = await fetch_task_lists([f"tasks:{bucket}" for bucket in buckets])
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
-    return {
-        "active": active,
-        "pending": pending,
-        "completed": completed,
-        "cancelled": cancelled,
-        "failed": failed,
-    }
+    return {bucket: tasks[f"tasks:{bucket}"] for bucket in buckets}
 
 
 async def get_task(task_id: str) -> Dict[str, Any]:
     try:
-        metadata = await get_task_metadata(task_id)
-        log_length = await get_task_log_length(task_id)
+        return await get_task_summary(task_id)
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
-    metadata["log_length"] = log_length
-    return metadata
-
 
 async def get_task_log(task_id: str) -> Dict[str, Any]:
     try:
@@ -486,14 +629,51 @@ async def persist_task_log_file(task_id: str) -> Dict[str, Any]:
     return {"task_id": task_id, "log_file": str(path)}
 
 
-async def get_task_log_file(task_id: str) -> FileResponse:
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for token in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in token.split(";")]
+        if coding.lower() not in {"gzip", "*"}:
+            continue
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _read_gzip_chunks(path: Path) -> Iterator[bytes]:
+    with gzip.open(path, "rb") as file:
+        while chunk := file.read(64 * 1024):
+            yield chunk
+
+
+async def get_task_log_file(task_id: str, accept_encoding: str = "") -> Response:
     try:
         log_path = await get_or_create_log_file(task_id)
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
 
-    if not log_path.exists():  # pragma: no cover - defensive
-        raise HTTPException(status_code=404, detail="Log file not found.")
-
+    # ``get_or_create_log_file`` has just checked or written the file.
     filename = f"task-{task_id}.txt"
-    return FileResponse(log_path, media_type="text/plain", filename=filename)
+    if log_path.suffix != ".gz":
+        # Written before logs were stored compressed.
+        return FileResponse(log_path, media_type="text/plain", filename=filename)
+    if _accepts_gzip(accept_encoding):
+        return FileResponse(
+            log_path,
+            media_type="text/plain",
+            filename=filename,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return StreamingResponse(
+        iterate_in_threadpool(_read_gzip_chunks(log_path)),
+        media_type="text/plain",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Vary": "Accept-Encoding",
+        },
+    )
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
+import socket
+import time
+from collections import OrderedDict
 from contextlib import suppress
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from backend.mcp import stream_agent_events
 
@@ -19,15 +24,48 @@ from ..models import LLMModel, PromptTemplate, TestCase, TestRun
 from ..schemas import QualityCategoryInsight, QualityInsightsResponse
 from ..services.prompts import DEFAULT_PROMPT_TEMPLATE, render_task_prompt
 from ..services.session_pool import SESSION_POOL, SessionDefinition
-from ..utils.json import dump_dict, load_dict, load_json_list, load_string_list
+from ..services.task_registry import redis_client, safe_redis_call
+from ..utils.json import dump_dict, load_string_list, parse_event_payload
 
-run_queue: asyncio.Queue[int] = asyncio.Queue()
-_run_workers: List[asyncio.Task[Any]] = []
+_run_dispatcher: Optional[asyncio.Task[None]] = None
+_replica_lease: Optional[asyncio.Task[None]] = None
+_inflight_runs: Set[asyncio.Task[None]] = set()
+
+RUN_LOG_LIMIT = 200
+RUN_LOG_FLUSH_COUNT = 25
+RUN_LOG_FLUSH_INTERVAL = 0.5
+_JSON_INSERT_MAX_ENTRIES = 60
+RUN_QUEUE_KEY = "runs:queue"
+RUN_INFLIGHT_KEY = "runs:inflight"
+RUN_QUEUE_POLL_TIMEOUT = 5
+RUN_QUEUE_RETRY_DELAY = 1.0
+RUN_REPLICA_ID = os.getenv("RUN_REPLICA_ID") or socket.gethostname()
+RUN_REPLICA_TTL = 30
+TEST_CASE_CACHE_SIZE = 1024
+TEST_CASE_CACHE_TTL = 60.0
+
+
+@dataclass(frozen=True)
+class _TestCaseSnapshot:
+    reference: str
+    title: str
+
+
+_test_case_cache: OrderedDict[int, Tuple[float, _TestCaseSnapshot]] = OrderedDict()
+
+
+def _create_missing_indexes(connection: Any) -> None:
+    # ``create_all`` skips tables that already exist, so indexes added to a
+    # model after its table was created have to be backfilled explicitly.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
 
 
 async def initialise_database() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
 
 
 async def ensure_default_records() -> None:
@@ -105,38 +143,235 @@ async def ensure_default_records() -> None:
         await session.commit()
 
 
-async def resume_queued_runs() -> None:
+async def enqueue_test_runs(run_ids: Sequence[int]) -> None:
+    if run_ids:
+        await safe_redis_call(redis_client.rpush(RUN_QUEUE_KEY, *run_ids))
+
+
+def _replica_key(replica_id: str) -> str:
+    return f"runs:replica:{replica_id}"
+
+
+async def _refresh_replica_lease() -> None:
+    await safe_redis_call(
+        redis_client.set(_replica_key(RUN_REPLICA_ID), "1", ex=RUN_REPLICA_TTL)
+    )
+
+
+async def _live_replicas(replica_ids: Set[str]) -> Set[str]:
+    if not replica_ids:
+        return set()
+    ordered = sorted(replica_ids)
+    leases = await safe_redis_call(redis_client.mget([_replica_key(rid) for rid in ordered]))
+    return {rid for rid, lease in zip(ordered, leases) if lease is not None}
+
+
+# Deletes each claim only while it still names the owner the caller saw and
+# returns the run ids whose claims were removed, so concurrent sweeps never
+# both take over the same run.
+_RELEASE_STALE_CLAIMS = redis_client.register_script(
+    """
+local released = {}
+for i = 1, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+        released[#released + 1] = ARGV[i]
+    end
+end
+return released
+"""
+)
+
+
+async def _requeue_orphaned_runs(*, at_startup: bool) -> None:
+    """Put runs whose owner is gone back on the queue.
+
+    A run claimed by a replica whose lease has expired is always orphaned.
+    At startup, runs claimed by this replica id and unclaimed running or
+    pending runs are orphaned too, and queued runs missing from the Redis
+    list are pushed again. A claimed run is only requeued by the caller that
+    removed its claim.
+    """
+    owners: Dict[str, str] = await safe_redis_call(redis_client.hgetall(RUN_INFLIGHT_KEY))
+    live = await _live_replicas(set(owners.values()) - {RUN_REPLICA_ID})
+
+    def is_orphaned(run_id: str) -> bool:
+        owner = owners.get(run_id)
+        if owner is None or owner == RUN_REPLICA_ID:
+            return at_startup
+        return owner not in live
+
+    stale_claims = [run_id for run_id in owners if is_orphaned(run_id)]
+    if not at_startup and not stale_claims:
+        return
+
+    released: Set[str] = set()
+    if stale_claims:
+        released = set(
+            await safe_redis_call(
+                _RELEASE_STALE_CLAIMS(
+                    keys=[RUN_INFLIGHT_KEY],
+                    args=[value for run_id in stale_claims for value in (run_id, owners[run_id])],
+                )
+            )
+        )
+
+    def should_requeue(run_id: str) -> bool:
+        if run_id in owners:
+            return run_id in released
+        return at_startup
+
+    statuses = ["running", "pending"]
+    waiting: Set[str] = set()
+    if at_startup:
+        statuses.append("queued")
+        waiting = set(await safe_redis_call(redis_client.lrange(RUN_QUEUE_KEY, 0, -1)))
+
     async with AsyncSessionLocal() as session:
         result = await session.execute(
-            select(TestRun).where(TestRun.status.in_(["queued", "running", "pending"]))
+            select(TestRun).where(TestRun.status.in_(statuses)).order_by(TestRun.id)
         )
         runs = result.scalars().all()
+        now = datetime.utcnow()
         for run in runs:
-            if run.status in {"running", "pending"}:
+            if run.status in {"running", "pending"} and should_requeue(str(run.id)):
                 run.status = "queued"
                 run.started_at = None
                 run.task_id = None
-                run.updated_at = datetime.utcnow()
+                run.updated_at = now
+        queued_ids = [
+            run.id for run in runs if run.status == "queued" and str(run.id) not in waiting
+        ]
         await session.commit()
 
-        for run in runs:
-            await run_queue.put(run.id)
+    await enqueue_test_runs(queued_ids)
+
+
+async def resume_queued_runs() -> None:
+    """Re-enqueue runs a previous process left unfinished.
+
+    Runs still claimed by a live replica are left alone, so restarting one
+    replica does not steal work from the others.
+    """
+    await _refresh_replica_lease()
+    await _requeue_orphaned_runs(at_startup=True)
+
+
+async def _maintain_replica_lease() -> None:
+    """Keep this replica's lease alive and take over runs of expired ones."""
+    while True:
+        with suppress(Exception):  # pragma: no cover - defensive
+            await _refresh_replica_lease()
+            await _requeue_orphaned_runs(at_startup=False)
+        await asyncio.sleep(RUN_REPLICA_TTL / 3)
+
+
+def _appended_log_expression(entry_jsons: Sequence[str]) -> Any:
+    appended: Any = TestRun.log
+    # SQLite caps SQL functions at 127 arguments, so large batches are split
+    # across nested json_insert calls.
+    for start in range(0, len(entry_jsons), _JSON_INSERT_MAX_ENTRIES):
+        edits: List[Any] = []
+        for entry_json in entry_jsons[start : start + _JSON_INSERT_MAX_ENTRIES]:
+            edits.extend(("$[#]", func.json(entry_json)))
+        appended = func.json_insert(appended, *edits)
+    items = func.json_each(appended).table_valued("key", "value")
+    return (
+        select(func.json_group_array(items.c.value))
+        .where(items.c.key >= func.json_array_length(appended) - RUN_LOG_LIMIT)
+        .scalar_subquery()
+    )
+
+
+def build_run_log_entry(
+    message: str, level: str = "info", timestamp: Optional[datetime] = None
+) -> Dict[str, str]:
+    return {
+        "timestamp": (timestamp or datetime.utcnow()).isoformat(),
+        "type": level,
+        "message": message,
+    }
+
+
+async def append_run_log_entries(
+    session: AsyncSession,
+    run: TestRun,
+    entries: Sequence[Dict[str, str]],
+    now: Optional[datetime] = None,
+) -> None:
+    if not entries:
+        return
+    now = now or datetime.utcnow()
+    # Append server-side with JSON1 so the stored log is never read back and
+    # re-serialised; the in-memory copy is mirrored without marking it dirty.
+    await session.execute(
+        update(TestRun)
+        .where(TestRun.id == run.id)
+        .values(
+            log=_appended_log_expression([dump_dict(entry) for entry in entries]),
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    current_log = run.log if isinstance(run.log, list) else []
+    set_committed_value(run, "log", [*current_log, *entries][-RUN_LOG_LIMIT:])
+    set_committed_value(run, "updated_at", now)
+    await session.commit()
 
 
 async def append_run_log_entry(
     session: AsyncSession, run: TestRun, message: str, level: str = "info"
 ) -> None:
-    log_entries = load_json_list(run.log)
-    log_entries.append(
-        {
-            "timestamp": datetime.utcnow().isoformat(),
-            "type": level,
-            "message": message,
-        }
+    now = datetime.utcnow()
+    await append_run_log_entries(
+        session, run, [build_run_log_entry(message, level, now)], now
     )
-    run.log = json.dumps(log_entries[-200:])
-    run.updated_at = datetime.utcnow()
-    await session.commit()
+
+
+async def _stream_run_log(session: AsyncSession, run: TestRun) -> None:
+    """Record agent output for ``run``, committing it in batches.
+
+    Entries are flushed once ``RUN_LOG_FLUSH_COUNT`` accumulate or
+    ``RUN_LOG_FLUSH_INTERVAL`` seconds after the oldest unflushed entry, so a
+    chatty agent costs one commit per batch rather than one per line while
+    slow output still shows up promptly.
+    """
+    loop = asyncio.get_running_loop()
+    events = stream_agent_events(
+        run.prompt,
+        run.server_url,
+        None,
+        "{task}",
+        render_task_prompt,
+    ).__aiter__()
+    pending: List[Dict[str, str]] = []
+    flush_at = 0.0
+    next_event: asyncio.Future[str] = asyncio.ensure_future(events.__anext__())
+    try:
+        while True:
+            timeout = max(0.0, flush_at - loop.time()) if pending else None
+            done, _ = await asyncio.wait({next_event}, timeout=timeout)
+            if not done:
+                await append_run_log_entries(session, run, pending)
+                pending = []
+                continue
+            try:
+                payload = next_event.result()
+            except StopAsyncIteration:
+                break
+            message_type, message_text = parse_event_payload(payload)
+            if not pending:
+                flush_at = loop.time() + RUN_LOG_FLUSH_INTERVAL
+            pending.append(build_run_log_entry(message_text, message_type))
+            if len(pending) >= RUN_LOG_FLUSH_COUNT or loop.time() >= flush_at:
+                await append_run_log_entries(session, run, pending)
+                pending = []
+            next_event = asyncio.ensure_future(events.__anext__())
+    finally:
+        if not next_event.done():
+            next_event.cancel()
+            await asyncio.wait({next_event})
+        await append_run_log_entries(session, run, pending)
 
 
 async def update_manual_run(
@@ -195,29 +430,72 @@ async def log_manual_run(run_id: int, message: str, level: str = "info") -> None
         await append_run_log_entry(session, run, message, level)
 
 
+async def _get_case_cached(
+    session: AsyncSession, case_id: int
+) -> Optional[_TestCaseSnapshot]:
+    """Return the fields a run needs from its test case, cached across runs.
+
+    Batch-queued runs mostly share a handful of test cases, so the worker keeps
+    a small LRU of detached snapshots instead of selecting the case per run.
+    Entries expire after ``TEST_CASE_CACHE_TTL`` seconds and are dropped
+    eagerly by ``invalidate_test_case_cache`` when a case is edited.
+    """
+    now = time.monotonic()
+    cached = _test_case_cache.get(case_id)
+    if cached is not None and cached[0] > now:
+        _test_case_cache.move_to_end(case_id)
+        return cached[1]
+
+    row = (
+        await session.execute(
+            select(TestCase.reference, TestCase.title).where(TestCase.id == case_id)
+        )
+    ).first()
+    if row is None:
+        _test_case_cache.pop(case_id, None)
+        return None
+
+    snapshot = _TestCaseSnapshot(reference=row.reference, title=row.title)
+    _test_case_cache[case_id] = (now + TEST_CASE_CACHE_TTL, snapshot)
+    _test_case_cache.move_to_end(case_id)
+    while len(_test_case_cache) > TEST_CASE_CACHE_SIZE:
+        _test_case_cache.popitem(last=False)
+    return snapshot
+
+
+def invalidate_test_case_cache(case_id: int) -> None:
+    _test_case_cache.pop(case_id, None)
+
+
 async def process_test_run(run_id: int) -> None:
     async with AsyncSessionLocal() as session:
-        run = await session.get(TestRun, run_id)
-        if run is None:
+        # Moving the run out of ``queued`` only when it is still there means a
+        # run that was pushed onto the queue twice is started once.
+        claimed = await session.execute(
+            update(TestRun)
+            .where(TestRun.id == run_id, TestRun.status == "queued")
+            .values(status="pending", updated_at=datetime.utcnow())
+        )
+        await session.commit()
+        if claimed.rowcount == 0:
             return
 
-        if run.status not in {"queued", "pending"}:
+        run = await session.get(TestRun, run_id)
+        if run is None:
             return
 
-        test_case = await session.get(TestCase, run.test_case_id)
+        test_case = await _get_case_cached(session, run.test_case_id)
         if test_case is None:
             run.status = "failed"
             run.result = "missing-test-case"
-            run.completed_at = datetime.utcnow()
-            run.updated_at = datetime.utcnow()
+            now = datetime.utcnow()
+            run.completed_at = now
+            run.updated_at = now
             await append_run_log_entry(session, run, "Test case not found", "error")
             return
 
         allocation: SessionDefinition | None = await SESSION_POOL.acquire_nowait()
         if allocation is None:
-            run.status = "pending"
-            run.updated_at = datetime.utcnow()
-            await session.commit()
             await append_run_log_entry(
                 session,
                 run,
@@ -227,8 +505,9 @@ async def process_test_run(run_id: int) -> None:
             allocation = await SESSION_POOL.acquire()
 
         run.status = "running"
-        run.started_at = datetime.utcnow()
-        run.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        run.started_at = now
+        run.updated_at = now
         run.server_url = allocation.server_url
         run.xpra_url = allocation.xpra_url
         await session.commit()
@@ -247,22 +526,7 @@ async def process_test_run(run_id: int) -> None:
         )
 
         try:
-            async for payload in stream_agent_events(
-                run.prompt,
-                run.server_url,
-                None,
-                "{task}",
-                render_task_prompt,
-            ):
-                try:
-                    data = json.loads(payload)
-                    message_type = str(data.get("type", "info"))
-                    message_text = str(data.get("message", ""))
-                except json.JSONDecodeError:
-                    message_type = "info"
-                    message_text = payload
-
-                await append_run_log_entry(session, run, message_text, message_type)
+            await _stream_run_log(session, run)
         except Exception as exc:  # pragma: no cover - defensive
             await append_run_log_entry(
                 session,
@@ -272,8 +536,9 @@ async def process_test_run(run_id: int) -> None:
             )
             run.status = "failed"
             run.result = "error"
-            run.completed_at = datetime.utcnow()
-            run.updated_at = datetime.utcnow()
+            now = datetime.utcnow()
+            run.completed_at = now
+            run.updated_at = now
             await session.commit()
             return
         finally:
@@ -283,13 +548,14 @@ async def process_test_run(run_id: int) -> None:
 
         run.status = "completed"
         run.result = "success"
-        run.completed_at = datetime.utcnow()
-        run.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        run.completed_at = now
+        run.updated_at = now
         if run.started_at and run.completed_at:
             duration = (run.completed_at - run.started_at).total_seconds()
-            metrics = load_dict(run.metrics)
+            metrics = dict(run.metrics) if isinstance(run.metrics, dict) else {}
             metrics["duration"] = duration
-            run.metrics = dump_dict(metrics)
+            run.metrics = metrics
         await session.commit()
 
         await append_run_log_entry(
@@ -300,139 +566,239 @@ async def process_test_run(run_id: int) -> None:
         )
 
 
-async def run_worker(worker_index: int) -> None:
+async def _execute_run(run_id: int, semaphore: asyncio.Semaphore) -> None:
+    claimed = True
+    try:
+        with suppress(RuntimeError):
+            claimed = bool(
+                await safe_redis_call(
+                    redis_client.hsetnx(RUN_INFLIGHT_KEY, run_id, RUN_REPLICA_ID)
+                )
+            )
+        if not claimed:
+            # Another owner already holds this run; this copy is a duplicate.
+            return
+        await process_test_run(run_id)
+    except Exception as exc:  # pragma: no cover - defensive
+        async with AsyncSessionLocal() as session:
+            run = await session.get(TestRun, run_id)
+            if run is not None:
+                run.status = "failed"
+                run.result = "error"
+                run.updated_at = datetime.utcnow()
+                await append_run_log_entry(
+                    session,
+                    run,
+                    f"Run dispatcher encountered an error: {exc}",
+                    "error",
+                )
+    finally:
+        semaphore.release()
+    if not claimed:
+        return
+    # A run cancelled at shutdown keeps its claim so it is requeued once this
+    # replica restarts or its lease lapses.
+    with suppress(RuntimeError):
+        await safe_redis_call(redis_client.hdel(RUN_INFLIGHT_KEY, run_id))
+
+
+async def dispatch_runs(max_inflight: int) -> None:
+    """Start queued runs as tasks, keeping at most ``max_inflight`` running.
+
+    Runs are popped from the shared Redis list only once a slot is free, so
+    queued work stays available to other replicas until this one can start it.
+    The limit only counts this replica's runs: sessions are handed out by the
+    in-process ``SESSION_POOL``, so each session pool must be owned by a
+    single replica.
+    """
+    semaphore = asyncio.Semaphore(max_inflight)
     while True:
-        run_id = await run_queue.get()
+        await semaphore.acquire()
         try:
-            await process_test_run(run_id)
-        except Exception as exc:  # pragma: no cover - defensive
-            async with AsyncSessionLocal() as session:
-                run = await session.get(TestRun, run_id)
-                if run is not None:
-                    run.status = "failed"
-                    run.result = "error"
-                    run.updated_at = datetime.utcnow()
-                    await append_run_log_entry(
-                        session,
-                        run,
-                        f"Worker {worker_index} encountered an error: {exc}",
-                        "error",
-                    )
-        finally:
-            run_queue.task_done()
-
-
-async def start_worker_pool(worker_count: int) -> None:
-    for index in range(worker_count):
-        task = asyncio.create_task(run_worker(index))
-        _run_workers.append(task)
-
-
-async def stop_worker_pool() -> None:
-    for task in _run_workers:
+            popped = await safe_redis_call(
+                redis_client.blpop(RUN_QUEUE_KEY, timeout=RUN_QUEUE_POLL_TIMEOUT)
+            )
+        except RuntimeError:
+            semaphore.release()
+            await asyncio.sleep(RUN_QUEUE_RETRY_DELAY)
+            continue
+        if popped is None:
+            semaphore.release()
+            continue
+        try:
+            run_id = int(popped[1])
+        except ValueError:
+            semaphore.release()
+            continue
+        task = asyncio.create_task(_execute_run(run_id, semaphore))
+        _inflight_runs.add(task)
+        task.add_done_callback(_inflight_runs.discard)
+
+
+async def start_run_dispatcher(max_inflight: int) -> None:
+    global _run_dispatcher, _replica_lease
+    if _run_dispatcher is None:
+        _run_dispatcher = asyncio.create_task(dispatch_runs(max_inflight))
+    if _replica_lease is None:
+        _replica_lease = asyncio.create_task(_maintain_replica_lease())
+
+
+async def stop_run_dispatcher() -> None:
+    global _run_dispatcher, _replica_lease
+    tasks = [*_inflight_runs]
+    for background in (_run_dispatcher, _replica_lease):
+        if background is not None:
+            tasks.append(background)
+    _run_dispatcher = None
+    _replica_lease = None
+    for task in tasks:
         task.cancel()
-    for task in _run_workers:
+    for task in tasks:
         with suppress(asyncio.CancelledError):
             await task
-    _run_workers.clear()
+    _inflight_runs.clear()
+    # Dropping the lease lets a replacement replica reclaim runs cancelled here
+    # straight away instead of waiting for the lease to expire.
+    with suppress(RuntimeError):
+        await safe_redis_call(redis_client.delete(_replica_key(RUN_REPLICA_ID)))
+
+
+@lru_cache(maxsize=1024)
+def _render_case_prompt(
+    reference: str,
+    title: str,
+    description: Optional[str],
+    category: Optional[str],
+    priority: str,
+    steps_raw: str,
+) -> str:
+    # Keyed on every field the prompt is built from, so an edited test case
+    # simply misses the cache instead of needing explicit invalidation.
+    steps = load_string_list(steps_raw)
+    steps_section = (
+        "\n".join(map("- {}".format, steps)) if steps else "- Follow documented test scenario steps."
+    )
+    return (
+        f"Execute automated test case {reference}: {title}.\n"
+        f"Description: {description or 'No description provided.'}\n"
+        f"Category: {category or 'Uncategorized'} | Priority: {priority}\n"
+        f"Steps:\n{steps_section}\n"
+        "Report detailed step results and ensure assertions complete successfully."
+    )
 
 
 def build_prompt_for_case(test_case: TestCase, override_prompt: Optional[str]) -> str:
     if override_prompt:
         return override_prompt
 
-    steps = load_string_list(test_case.steps)
-    steps_section = "\n".join(f"- {step}" for step in steps) if steps else "- Follow documented test scenario steps."
-    description = test_case.description or "No description provided."
-    category = test_case.category or "Uncategorized"
-    return (
-        f"Execute automated test case {test_case.reference}: {test_case.title}.\n"
-        f"Description: {description}\n"
-        f"Category: {category} | Priority: {test_case.priority}\n"
-        f"Steps:\n{steps_section}\n"
-        "Report detailed step results and ensure assertions complete successfully."
+    return _render_case_prompt(
+        test_case.reference,
+        test_case.title,
+        test_case.description,
+        test_case.category,
+        test_case.priority,
+        test_case.steps,
     )
 
 
-def compute_quality_insights(
-    cases: List[TestCase], runs: List[TestRun]
-) -> QualityInsightsResponse:
-    ready_count = sum(1 for case in cases if case.status == "Ready")
-    blocked_count = sum(1 for case in cases if case.status == "Blocked")
-    draft_count = sum(1 for case in cases if case.status == "Draft")
+def _breakdown_key(column: Any, fallback: str) -> Any:
+    return func.coalesce(func.nullif(column, ""), fallback)
+
+
+def _valid_duration() -> Any:
+    # Only numeric durations count towards the average, mirroring the old
+    # Python-side ``isinstance(duration, (int, float))`` check. The nested CASE
+    # keeps SQLite from evaluating json_extract on malformed metrics.
+    return case(
+        (
+            func.json_valid(TestRun.metrics) == 1,
+            case(
+                (
+                    func.json_type(TestRun.metrics, "$.duration").in_(["integer", "real"]),
+                    func.json_extract(TestRun.metrics, "$.duration"),
+                ),
+            ),
+        ),
+    )
 
-    total_runs = len(runs)
-    pass_count = sum(1 for run in runs if run.result == "success")
-    fail_count = sum(1 for run in runs if run.status == "failed")
-    success_rate = (pass_count / total_runs * 100) if total_runs else 0.0
 
-    durations: List[float] = []
-    latest_run_at: Optional[datetime] = None
-    for run in runs:
-        metrics = load_dict(run.metrics)
-        duration = metrics.get("duration")
-        if isinstance(duration, (int, float)):
-            durations.append(float(duration))
-        completed_at = run.completed_at or run.updated_at or run.created_at
-        if completed_at and (latest_run_at is None or completed_at > latest_run_at):
-            latest_run_at = completed_at
-
-    average_duration = sum(durations) / len(durations) if durations else 0.0
-
-    cases_by_id = {case.id: case for case in cases}
-    category_stats: Dict[str, Dict[str, float]] = {}
-    priority_stats: Dict[str, Dict[str, float]] = {}
-
-    for case in cases:
-        category_key = case.category or "Uncategorized"
-        priority_key = case.priority or "Unspecified"
-        category_stats.setdefault(category_key, {"total": 0, "runs": 0, "pass": 0})
-        priority_stats.setdefault(priority_key, {"total": 0, "runs": 0, "pass": 0})
-        category_stats[category_key]["total"] += 1
-        priority_stats[priority_key]["total"] += 1
-
-    for run in runs:
-        case = cases_by_id.get(run.test_case_id)
-        if case is None:
-            continue
-        category_key = case.category or "Uncategorized"
-        priority_key = case.priority or "Unspecified"
-        category_entry = category_stats.setdefault(category_key, {"total": 0, "runs": 0, "pass": 0})
-        priority_entry = priority_stats.setdefault(priority_key, {"total": 0, "runs": 0, "pass": 0})
-        category_entry["runs"] += 1
-        priority_entry["runs"] += 1
-        if run.result == "success":
-            category_entry["pass"] += 1
-            priority_entry["pass"] += 1
-
-    category_breakdown = [
+def _to_insights(stats: Dict[str, List[int]]) -> List[QualityCategoryInsight]:
+    return [
         QualityCategoryInsight(
             key=key,
-            total=int(stats["total"]),
-            pass_rate=(stats["pass"] / stats["runs"] * 100) if stats["runs"] else 0.0,
+            total=total,
+            pass_rate=(pass_total / runs * 100) if runs else 0.0,
         )
-        for key, stats in category_stats.items()
+        for key, (total, runs, pass_total) in sorted(stats.items())
     ]
 
-    priority_breakdown = [
-        QualityCategoryInsight(
-            key=key,
-            total=int(stats["total"]),
-            pass_rate=(stats["pass"] / stats["runs"] * 100) if stats["runs"] else 0.0,
+
+async def _fetch_breakdowns(
+    session: AsyncSession,
+) -> tuple[List[QualityCategoryInsight], List[QualityCategoryInsight]]:
+    category_key = _breakdown_key(TestCase.category, "Uncategorized")
+    priority_key = _breakdown_key(TestCase.priority, "Unspecified")
+    passed = func.sum(case((TestRun.result == "success", 1), else_=0))
+    result = await session.execute(
+        select(
+            category_key,
+            priority_key,
+            func.count(func.distinct(TestCase.id)),
+            func.count(TestRun.id),
+            passed,
         )
-        for key, stats in priority_stats.items()
-    ]
+        .select_from(TestCase)
+        .outerjoin(TestRun, TestRun.test_case_id == TestCase.id)
+        .group_by(category_key, priority_key)
+    )
+
+    # Every case falls in exactly one (category, priority) group, so both
+    # breakdowns can be folded from the same grouped rows.
+    category_stats: Dict[str, List[int]] = {}
+    priority_stats: Dict[str, List[int]] = {}
+    for category, priority, total, runs, pass_total in result.all():
+        for stats, key in ((category_stats, category), (priority_stats, priority)):
+            entry = stats.setdefault(key, [0, 0, 0])
+            entry[0] += int(total)
+            entry[1] += int(runs)
+            entry[2] += int(pass_total or 0)
+
+    return _to_insights(category_stats), _to_insights(priority_stats)
+
+
+async def compute_quality_insights(session: AsyncSession) -> QualityInsightsResponse:
+    status_result = await session.execute(
+        select(TestCase.status, func.count()).group_by(TestCase.status)
+    )
+    case_counts: Dict[str, int] = {status: count for status, count in status_result.all()}
+
+    run_result = await session.execute(
+        select(
+            func.count(TestRun.id),
+            func.sum(case((TestRun.result == "success", 1), else_=0)),
+            func.sum(case((TestRun.status == "failed", 1), else_=0)),
+            func.avg(_valid_duration()),
+            func.max(
+                func.coalesce(TestRun.completed_at, TestRun.updated_at, TestRun.created_at)
+            ),
+        )
+    )
+    total_runs, pass_count, fail_count, average_duration, latest_run_at = run_result.one()
+    category_breakdown, priority_breakdown = await _fetch_breakdowns(session)
+    total_runs = int(total_runs or 0)
+    pass_count = int(pass_count or 0)
+    success_rate = (pass_count / total_runs * 100) if total_runs else 0.0
 
     return QualityInsightsResponse(
-        total_test_cases=len(cases),
-        ready_test_cases=ready_count,
-        blocked_test_cases=blocked_count,
-        draft_test_cases=draft_count,
+        total_test_cases=sum(case_counts.values()),
+        ready_test_cases=case_counts.get("Ready", 0),
+        blocked_test_cases=case_counts.get("Blocked", 0),
+        draft_test_cases=case_counts.get("Draft", 0),
         total_runs=total_runs,
         pass_count=pass_count,
-        fail_count=fail_count,
+        fail_count=int(fail_count or 0),
         success_rate=success_rate,
-        average_duration=average_duration,
+        average_duration=float(average_duration or 0.0),
         latest_run_at=latest_run_at,
         category_breakdown=category_breakdown,
         priority_breakdown=priority_breakdown,
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+from typing import Iterator
+
+import fakeredis
+import pytest
+
+# Point the app at a throwaway database and an in-memory Redis before any
+# module that creates the engine or the Redis client is imported.
+_DATABASE_DIR = tempfile.mkdtemp(prefix="mcp-portal-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DATABASE_DIR}/test.db"
+
+from ..core import settings  # noqa: E402
+
+_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+settings.get_redis_client = lambda: _redis
+
+
+@pytest.fixture
+def redis_client() -> fakeredis.aioredis.FakeRedis:
+    asyncio.run(_redis.flushall())
+    return _redis
+
+
+@pytest.fixture
+def database() -> Iterator[None]:
+    from ..db.base import Base
+    from ..db.session import engine
+    from ..services.test_runs import initialise_database
+
+    async def _reset() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await initialise_database()
+
+    asyncio.run(_reset())
+    yield
+    asyncio.run(engine.dispose())
@@ -0,0 +1,111 @@
+import asyncio
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.mcp import agent, build_mcp_config
+
+
+class _FakeClient:
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.closed = False
+
+    async def close_all_sessions(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_clients(monkeypatch) -> List[_FakeClient]:
+    created: List[_FakeClient] = []
+
+    def from_dict(config: Dict[str, Any]) -> _FakeClient:
+        created.append(_FakeClient(config))
+        return created[-1]
+
+    monkeypatch.setattr(agent.MCPClient, "from_dict", staticmethod(from_dict))
+    monkeypatch.setattr(agent, "_clients", {})
+    monkeypatch.delenv("MCP_GMAIL_OTP_URL", raising=False)
+    return created
+
+
+def test_client_is_rebuilt_when_config_changes(fake_clients, monkeypatch) -> None:
+    async def scenario() -> None:
+        first = await agent._get_client("http://server/sse")
+        assert await agent._get_client("http://server/sse") is first
+
+        monkeypatch.setenv("MCP_GMAIL_OTP_URL", "http://otp/sse")
+        second = await agent._get_client("http://server/sse")
+        assert second is not first
+        assert first.closed
+
+    asyncio.run(scenario())
+    assert len(fake_clients) == 2
+
+
+def test_cancelled_run_discards_client(fake_clients, monkeypatch) -> None:
+    started = asyncio.Event()
+
+    class _BlockingAgent:
+        def __init__(self, **kwargs: Any) -> None:
+            pass
+
+        async def stream_events(self, prompt: str, max_steps: int):
+            started.set()
+            await asyncio.Event().wait()
+            yield {}
+
+    monkeypatch.setattr(agent, "MCPAgent", _BlockingAgent)
+    monkeypatch.setattr(agent, "_create_llm", lambda settings: None)
+
+    async def scenario() -> None:
+        async def consume() -> None:
+            async for _ in agent.stream_agent_events(
+                "task", "http://server/sse", None, None, lambda task, template: task
+            ):
+                pass
+
+        run = asyncio.create_task(consume())
+        await started.wait()
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(scenario())
+    assert fake_clients[0].closed
+    assert agent._clients == {}
+
+
+def test_mcp_config_follows_servers_file_changes(monkeypatch, tmp_path) -> None:
+    servers_file = tmp_path / "servers.json"
+    servers_file.write_text('{"mcpServers": {"docs": "http://docs/sse"}}')
+    monkeypatch.setenv("MCP_SERVERS_FILE", str(servers_file))
+    monkeypatch.delenv("MCP_ADDITIONAL_SERVERS", raising=False)
+
+    first = build_mcp_config("http://server/sse")
+    assert first["mcpServers"]["docs"] == {"url": "http://docs/sse"}
+    assert build_mcp_config("http://server/sse") == first
+
+    servers_file.write_text('{"mcpServers": {"wiki": "http://wiki/sse"}}')
+    stat = servers_file.stat()
+    os.utime(servers_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = build_mcp_config("http://server/sse")
+    assert "docs" not in second["mcpServers"]
+    assert second["mcpServers"]["wiki"] == {"url": "http://wiki/sse"}
+
+
+def test_mcp_config_notices_same_mtime_rewrites(monkeypatch, tmp_path) -> None:
+    servers_file = tmp_path / "servers.json"
+    servers_file.write_text('{"docs": "http://docs/sse"}')
+    original = servers_file.stat()
+    monkeypatch.setenv("MCP_SERVERS_FILE", str(servers_file))
+    monkeypatch.delenv("MCP_ADDITIONAL_SERVERS", raising=False)
+
+    assert "docs" in build_mcp_config("http://server/sse")["mcpServers"]
+
+    servers_file.write_text('{"knowledge": "http://knowledge/sse"}')
+    os.utime(servers_file, ns=(original.st_atime_ns, original.st_mtime_ns))
+
+    assert "knowledge" in build_mcp_config("http://server/sse")["mcpServers"]
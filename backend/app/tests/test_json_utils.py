@@ -0,0 +1,14 @@
+from ..utils.json import parse_event_payload
+
+
+def test_parse_event_payload_reads_type_and_message() -> None:
+    payload = '{"type": "event", "message": "Tool call finished"}'
+
+    assert parse_event_payload(payload) == ("event", "Tool call finished")
+
+
+def test_parse_event_payload_treats_plain_text_as_info() -> None:
+    assert parse_event_payload("Agent started") == ("info", "Agent started")
+    assert parse_event_payload("{not json") == ("info", "{not json")
+    assert parse_event_payload("[1, 2]") == ("info", "[1, 2]")
+    assert parse_event_payload("") == ("info", "")
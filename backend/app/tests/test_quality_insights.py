@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import text
+
+from ..db.session import AsyncSessionLocal, engine
+from ..services.test_runs import compute_quality_insights
+
+_CASES = [
+    # (id, category, priority, status)
+    (1, "Login", "High", "Ready"),
+    (2, "Login", "Low", "Blocked"),
+    (3, "", "High", "Draft"),
+    (4, None, "Medium", "Ready"),
+]
+
+_RUNS = [
+    # (test_case_id, status, result, metrics, completed_at)
+    (1, "completed", "success", '{"duration": 10}', "2024-01-02 00:00:00"),
+    (1, "failed", "failure", '{"duration": 20.5}', "2024-01-03 00:00:00"),
+    (2, "completed", "success", '{"duration": "slow"}', None),
+    (3, "failed", None, "not json", None),
+]
+
+
+def _seed() -> None:
+    async def insert() -> None:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO test_cases (id, reference, title, category, priority, status,"
+                    " tags, steps, created_at, updated_at) VALUES (:id, 'TC-' || :id, 'Case',"
+                    " :category, :priority, :status, '[]', '[]', '2024-01-01 00:00:00',"
+                    " '2024-01-01 00:00:00')"
+                ),
+                [
+                    {"id": id_, "category": category, "priority": priority, "status": status}
+                    for id_, category, priority, status in _CASES
+                ],
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO test_runs (test_case_id, status, result, prompt, log, metrics,"
+                    " created_at, updated_at, completed_at) VALUES (:case_id, :status, :result,"
+                    " 'p', '[]', :metrics, '2024-01-01 00:00:00', '2024-01-01 00:00:00',"
+                    " :completed_at)"
+                ),
+                [
+                    {
+                        "case_id": case_id,
+                        "status": status,
+                        "result": result,
+                        "metrics": metrics,
+                        "completed_at": completed_at,
+                    }
+                    for case_id, status, result, metrics, completed_at in _RUNS
+                ],
+            )
+
+    asyncio.run(insert())
+
+
+def _compute():
+    async def compute():
+        async with AsyncSessionLocal() as session:
+            return await compute_quality_insights(session)
+
+    return asyncio.run(compute())
+
+
+def test_quality_insights_aggregate_cases_and_runs(database) -> None:
+    _seed()
+
+    insights = _compute()
+
+    assert insights.total_test_cases == 4
+    assert (insights.ready_test_cases, insights.blocked_test_cases, insights.draft_test_cases) == (
+        2,
+        1,
+        1,
+    )
+    assert (insights.total_runs, insights.pass_count, insights.fail_count) == (4, 2, 2)
+    assert insights.success_rate == 50.0
+    # Non-numeric and malformed durations are left out of the average.
+    assert insights.average_duration == 15.25
+    assert insights.latest_run_at == datetime(2024, 1, 3)
+
+    assert [(c.key, c.total, round(c.pass_rate, 2)) for c in insights.category_breakdown] == [
+        ("Login", 2, 66.67),
+        ("Uncategorized", 2, 0.0),
+    ]
+    assert [(c.key, c.total, round(c.pass_rate, 2)) for c in insights.priority_breakdown] == [
+        ("High", 2, 33.33),
+        ("Low", 1, 100.0),
+        ("Medium", 1, 0.0),
+    ]
+
+
+def test_quality_insights_without_data(database) -> None:
+    insights = _compute()
+
+    assert insights.total_test_cases == 0
+    assert insights.total_runs == 0
+    assert insights.success_rate == 0.0
+    assert insights.average_duration == 0.0
+    assert insights.latest_run_at is None
+    assert insights.category_breakdown == []
@@ -0,0 +1,146 @@
+import asyncio
+from typing import Iterator, List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from ..application import create_app
+from ..db.session import AsyncSessionLocal, engine
+from ..services import test_runs
+from ..services.test_runs import RUN_QUEUE_KEY
+
+
+@pytest.fixture
+def client(database, redis_client, monkeypatch) -> Iterator[TestClient]:
+    monkeypatch.setenv("TEST_RUN_MAX_INFLIGHT", "0")
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+def _insert_run(
+    status: str, result: str, *, copies: int = 1, started_at: Optional[str] = None
+) -> None:
+    async def insert() -> None:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO test_cases (reference, title, priority, status, tags, steps,"
+                    " created_at, updated_at) VALUES ('TC-1', 'Case', 'Medium', 'Draft',"
+                    " '[]', '[]', '2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO test_runs (test_case_id, status, result, prompt, log, metrics,"
+                    " created_at, updated_at, started_at) VALUES (1, :status, :result, 'p',"
+                    " '[]', '{}', '2024-01-01 00:00:00', '2024-01-01 00:00:00', :started_at)"
+                ),
+                [{"status": status, "result": result, "started_at": started_at}] * copies,
+            )
+
+    asyncio.run(insert())
+
+
+def test_list_test_runs_loads_rows_with_unlisted_status_values(client: TestClient) -> None:
+    _insert_run("archived", "timeout")
+
+    response = client.get("/test-runs")
+
+    assert response.status_code == 200
+    assert [(run["status"], run["result"]) for run in response.json()] == [
+        ("archived", "timeout")
+    ]
+
+
+def test_list_test_runs_streams_every_batch(client: TestClient) -> None:
+    _insert_run("completed", "passed", copies=250)
+
+    response = client.get("/test-runs", params={"include_log": False})
+
+    assert response.status_code == 200
+    runs = response.json()
+    assert len(runs) == 250
+    assert len({run["id"] for run in runs}) == 250
+
+
+def test_list_test_runs_fails_cleanly_when_first_batch_is_invalid(
+    database, redis_client, monkeypatch
+) -> None:
+    monkeypatch.setenv("TEST_RUN_MAX_INFLIGHT", "0")
+    _insert_run("completed", "passed", started_at="not a timestamp")
+
+    with TestClient(create_app(), raise_server_exceptions=False) as test_client:
+        response = test_client.get("/test-runs")
+
+    assert response.status_code == 500
+
+
+def _create_case(client: TestClient, reference: str, steps: List[str]) -> int:
+    response = client.post(
+        "/test-cases", json={"reference": reference, "title": reference, "steps": steps}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_queue_test_runs_returns_runs_in_request_order(
+    client: TestClient, redis_client
+) -> None:
+    first, second, third = (
+        _create_case(client, reference, ["step"]) for reference in ("TC-A", "TC-B", "TC-C")
+    )
+    requested = [third, first, second, first]
+
+    response = client.post(
+        "/test-runs",
+        json={
+            "test_case_ids": requested,
+            "model_config": {"name": "bulk", "provider": "openai"},
+        },
+    )
+
+    assert response.status_code == 201
+    runs = response.json()
+    assert [run["test_case_id"] for run in runs] == requested
+    assert all(run["status"] == "queued" for run in runs)
+    assert [run["log"][0]["message"] for run in runs] == ["Queued for execution"] * 4
+    queue = asyncio.run(redis_client.lrange(RUN_QUEUE_KEY, 0, -1))
+    assert queue == [str(run["id"]) for run in runs]
+
+
+def test_editing_a_case_evicts_it_from_the_run_cache(
+    client: TestClient, monkeypatch
+) -> None:
+    async def fake_stream(session, run) -> None:
+        return None
+
+    monkeypatch.setattr(test_runs, "_stream_run_log", fake_stream)
+    case_id = _create_case(client, "TC-E", ["Old step"])
+    spare_id = _create_case(client, "TC-F", ["Step"])
+
+    async def warm(*case_ids: int) -> None:
+        async with AsyncSessionLocal() as session:
+            for cached_id in case_ids:
+                await test_runs._get_case_cached(session, cached_id)
+
+    asyncio.run(warm(case_id, spare_id))
+    assert {case_id, spare_id} <= set(test_runs._test_case_cache)
+
+    response = client.put(
+        f"/test-cases/{case_id}", json={"title": "New title", "steps": ["New step"]}
+    )
+    assert response.status_code == 200
+    assert case_id not in test_runs._test_case_cache
+
+    run = client.post(
+        "/test-runs",
+        json={"test_case_ids": [case_id], "model_config": {"name": "m", "provider": "p"}},
+    ).json()[0]
+    assert "- New step\n" in run["prompt"]
+    asyncio.run(test_runs.process_test_run(run["id"]))
+    messages = [entry["message"] for entry in client.get(f"/test-runs/{run['id']}").json()["log"]]
+    assert "Started run for TC-E: New title" in messages
+
+    assert client.delete(f"/test-cases/{spare_id}").status_code == 204
+    assert spare_id not in test_runs._test_case_cache
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, List
+
+from .. import models
+from ..db.session import AsyncSessionLocal
+from ..services import test_runs
+from ..services.test_runs import (
+    RUN_LOG_LIMIT,
+    append_run_log_entries,
+    build_run_log_entry,
+)
+
+
+async def _create_run(session: Any) -> models.TestRun:
+    test_case = models.TestCase(reference="TC-LOG", title="Log handling")
+    session.add(test_case)
+    await session.commit()
+    run = models.TestRun(test_case_id=test_case.id, prompt="p", log=[], metrics={})
+    session.add(run)
+    await session.commit()
+    return run
+
+
+async def _stored_log(run_id: int) -> List[dict]:
+    async with AsyncSessionLocal() as session:
+        run = await session.get(models.TestRun, run_id)
+        return run.log
+
+
+def test_append_run_log_entries_trims_to_limit(database) -> None:
+    async def scenario() -> List[dict]:
+        async with AsyncSessionLocal() as session:
+            run = await _create_run(session)
+            for batch in range(3):
+                entries = [
+                    build_run_log_entry(f"entry {batch * 100 + index}")
+                    for index in range(100)
+                ]
+                await append_run_log_entries(session, run, entries)
+            assert len(run.log) == RUN_LOG_LIMIT
+            return await _stored_log(run.id)
+
+    log = asyncio.run(scenario())
+
+    assert len(log) == RUN_LOG_LIMIT
+    assert log[0]["message"] == "entry 100"
+    assert log[-1]["message"] == "entry 299"
+
+
+def test_stream_run_log_flushes_on_interval_during_steady_output(
+    database, monkeypatch
+) -> None:
+    async def slow_stream(*args: Any, **kwargs: Any):
+        for index in range(10):
+            await asyncio.sleep(0.04)
+            yield f'{{"type": "event", "message": "line {index}"}}'
+
+    flushes: List[int] = []
+    original = test_runs.append_run_log_entries
+
+    async def counting(session: Any, run: models.TestRun, entries: Any, now: Any = None) -> None:
+        if entries:
+            flushes.append(len(entries))
+        await original(session, run, entries, now)
+
+    monkeypatch.setattr(test_runs, "stream_agent_events", slow_stream)
+    monkeypatch.setattr(test_runs, "append_run_log_entries", counting)
+    monkeypatch.setattr(test_runs, "RUN_LOG_FLUSH_INTERVAL", 0.1)
+
+    async def scenario() -> List[dict]:
+        async with AsyncSessionLocal() as session:
+            run = await _create_run(session)
+            await test_runs._stream_run_log(session, run)
+            return await _stored_log(run.id)
+
+    log = asyncio.run(scenario())
+
+    assert [entry["message"] for entry in log] == [f"line {index}" for index in range(10)]
+    assert sum(flushes) == 10
+    assert len(flushes) >= 3
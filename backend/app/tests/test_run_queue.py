@@ -0,0 +1,202 @@
+import asyncio
+from typing import Dict, List
+
+from .. import models
+from ..db.session import AsyncSessionLocal
+from ..services import test_runs
+from ..services.test_runs import (
+    RUN_INFLIGHT_KEY,
+    RUN_QUEUE_KEY,
+    RUN_REPLICA_ID,
+    resume_queued_runs,
+)
+
+
+def _create_runs(*statuses: str) -> List[int]:
+    async def create() -> List[int]:
+        async with AsyncSessionLocal() as session:
+            test_case = models.TestCase(reference="TC-Q", title="Queue")
+            session.add(test_case)
+            await session.commit()
+            runs = [
+                models.TestRun(
+                    test_case_id=test_case.id, status=status, prompt="p", log=[], metrics={}
+                )
+                for status in statuses
+            ]
+            session.add_all(runs)
+            await session.commit()
+            return [run.id for run in runs]
+
+    return asyncio.run(create())
+
+
+def _statuses() -> Dict[int, str]:
+    async def load() -> Dict[int, str]:
+        async with AsyncSessionLocal() as session:
+            runs = (await session.execute(test_runs.select(models.TestRun))).scalars()
+            return {run.id: run.status for run in runs}
+
+    return asyncio.run(load())
+
+
+def test_resume_requeues_only_orphaned_runs(database, redis_client) -> None:
+    waiting, queued, own, live, dead, unclaimed, done = _create_runs(
+        "queued", "queued", "running", "running", "pending", "running", "completed"
+    )
+
+    async def prepare() -> None:
+        await redis_client.rpush(RUN_QUEUE_KEY, waiting)
+        await redis_client.hset(
+            RUN_INFLIGHT_KEY,
+            mapping={own: RUN_REPLICA_ID, live: "replica-live", dead: "replica-gone"},
+        )
+        await redis_client.set("runs:replica:replica-live", "1")
+
+    asyncio.run(prepare())
+    asyncio.run(resume_queued_runs())
+
+    queue = asyncio.run(redis_client.lrange(RUN_QUEUE_KEY, 0, -1))
+    claims = asyncio.run(redis_client.hgetall(RUN_INFLIGHT_KEY))
+    assert queue == [str(run_id) for run_id in (waiting, queued, own, dead, unclaimed)]
+    assert claims == {str(live): "replica-live"}
+    statuses = _statuses()
+    assert statuses[live] == "running"
+    assert statuses[done] == "completed"
+    assert {statuses[run_id] for run_id in (own, dead, unclaimed)} == {"queued"}
+
+
+def test_lease_sweep_takes_over_runs_of_expired_replicas(database, redis_client) -> None:
+    live, dead, unclaimed = _create_runs("running", "running", "running")
+
+    async def scenario() -> List[str]:
+        await redis_client.hset(
+            RUN_INFLIGHT_KEY, mapping={live: "replica-live", dead: "replica-gone"}
+        )
+        await redis_client.set("runs:replica:replica-live", "1")
+        await test_runs._requeue_orphaned_runs(at_startup=False)
+        return await redis_client.lrange(RUN_QUEUE_KEY, 0, -1)
+
+    assert asyncio.run(scenario()) == [str(dead)]
+    statuses = _statuses()
+    assert (statuses[live], statuses[dead], statuses[unclaimed]) == (
+        "running",
+        "queued",
+        "running",
+    )
+
+
+def test_dispatcher_runs_queued_ids_and_releases_claims(
+    database, redis_client, monkeypatch
+) -> None:
+    started: List[int] = []
+    claims_seen: List[str] = []
+
+    async def fake_process(run_id: int) -> None:
+        claims_seen.append(await redis_client.hget(RUN_INFLIGHT_KEY, run_id))
+        started.append(run_id)
+
+    monkeypatch.setattr(test_runs, "process_test_run", fake_process)
+    monkeypatch.setattr(test_runs, "RUN_QUEUE_POLL_TIMEOUT", 0.05)
+
+    async def scenario() -> Dict[str, str]:
+        await test_runs.enqueue_test_runs([3, 1, 2])
+        await test_runs.start_run_dispatcher(2)
+        for _ in range(100):
+            if len(started) == 3:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await test_runs.stop_run_dispatcher()
+        return await redis_client.hgetall(RUN_INFLIGHT_KEY)
+
+    assert asyncio.run(scenario()) == {}
+    assert sorted(started) == [1, 2, 3]
+    assert claims_seen == [RUN_REPLICA_ID] * 3
+
+
+def test_concurrent_sweeps_requeue_an_orphaned_run_once(database, redis_client) -> None:
+    (dead,) = _create_runs("running")
+
+    async def scenario() -> List[str]:
+        await redis_client.hset(RUN_INFLIGHT_KEY, dead, "replica-gone")
+        await asyncio.gather(
+            test_runs._requeue_orphaned_runs(at_startup=False),
+            test_runs._requeue_orphaned_runs(at_startup=False),
+        )
+        return await redis_client.lrange(RUN_QUEUE_KEY, 0, -1)
+
+    assert asyncio.run(scenario()) == [str(dead)]
+    assert _statuses()[dead] == "queued"
+
+
+def test_dispatcher_drops_runs_claimed_by_another_owner(
+    database, redis_client, monkeypatch
+) -> None:
+    started: List[int] = []
+
+    async def fake_process(run_id: int) -> None:
+        started.append(run_id)
+
+    monkeypatch.setattr(test_runs, "process_test_run", fake_process)
+
+    async def scenario() -> Dict[str, str]:
+        await redis_client.hset(RUN_INFLIGHT_KEY, 7, "replica-other")
+        semaphore = asyncio.Semaphore(1)
+        await semaphore.acquire()
+        await test_runs._execute_run(7, semaphore)
+        assert not semaphore.locked()
+        return await redis_client.hgetall(RUN_INFLIGHT_KEY)
+
+    assert asyncio.run(scenario()) == {"7": "replica-other"}
+    assert started == []
+
+
+def test_process_test_run_starts_a_queued_run_once(database, redis_client, monkeypatch) -> None:
+    (run_id,) = _create_runs("queued")
+    streamed: List[int] = []
+
+    async def fake_stream(session, run) -> None:
+        streamed.append(run.id)
+
+    monkeypatch.setattr(test_runs, "_stream_run_log", fake_stream)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            test_runs.process_test_run(run_id), test_runs.process_test_run(run_id)
+        )
+
+    asyncio.run(scenario())
+    assert streamed == [run_id]
+    assert _statuses()[run_id] == "completed"
+
+
+def test_case_prompts_are_cached_per_prompt_fields() -> None:
+    test_runs._render_case_prompt.cache_clear()
+    test_case = models.TestCase(
+        reference="TC-P",
+        title="Login",
+        description="Signs in",
+        category="Auth",
+        priority="High",
+        steps='["Open the page", "Sign in"]',
+    )
+
+    first = test_runs.build_prompt_for_case(test_case, None)
+    again = test_runs.build_prompt_for_case(test_case, None)
+    info = test_runs._render_case_prompt.cache_info()
+
+    assert again is first
+    assert (info.hits, info.misses) == (1, 1)
+    assert "- Open the page\n- Sign in\n" in first
+
+    test_case.steps = '["Open the page", "Sign out"]'
+    changed_steps = test_runs.build_prompt_for_case(test_case, None)
+    test_case.description = "Shows the dashboard"
+    changed_description = test_runs.build_prompt_for_case(test_case, None)
+
+    assert "- Sign out\n" in changed_steps and changed_steps != first
+    assert "Description: Shows the dashboard" in changed_description
+    assert changed_description != changed_steps
+    assert test_runs._render_case_prompt.cache_info().misses == 3
+    assert test_runs.build_prompt_for_case(test_case, "Override") == "Override"
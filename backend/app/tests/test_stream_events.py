@@ -0,0 +1,63 @@
+import orjson
+from langchain_core.agents import AgentFinish
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+from backend.mcp.agent import _SUCCESS_EVENT, _encode_event, is_progress_event
+from backend.mcp.events import extract_first_text, should_skip_stream_event, summarize_stream_event
+
+
+def test_token_chunks_are_skipped_before_any_conversion() -> None:
+    event = {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="hi")}}
+
+    assert should_skip_stream_event(event)
+    assert not should_skip_stream_event({"event": "on_tool_start", "data": {}})
+
+
+def test_raw_events_are_summarised() -> None:
+    tool_end = {
+        "event": "on_tool_end",
+        "name": "navigate",
+        "data": {
+            "output": ToolMessage(content=[{"type": "text", "text": "page"}], tool_call_id="1")
+        },
+    }
+    chain_end = {
+        "event": "on_chain_end",
+        "name": "Agent",
+        "data": {"output": AgentFinish(return_values={"output": "done!"}, log="")},
+    }
+
+    assert summarize_stream_event(tool_end) == ("On Tool End · navigate: page", None)
+    assert summarize_stream_event(chain_end) == ("On Chain End · Agent: done!", "done!")
+
+
+def test_extract_first_text_prefers_keys_depth_first() -> None:
+    value = {"meta": {"id": 7}, "payload": [{"note": "", "text": "deep"}], "text": "top"}
+
+    assert extract_first_text(value, ("text",)) == "top"
+    assert extract_first_text({"meta": {"id": 7}, "payload": ["x"]}) == "7"
+    assert extract_first_text({"empty": "", "none": None}) is None
+
+
+def test_events_are_made_json_safe_while_encoding() -> None:
+    event = {
+        "data": {"chunk": ToolMessage(content="ok", tool_call_id="1")},
+        "metadata": {1: "one", "tags": {"a"}},
+        "raw": b"\xffbytes",
+        "other": object,
+    }
+
+    decoded = orjson.loads(_encode_event(event))
+
+    assert decoded["data"]["chunk"] == {"type": "tool", "content": "ok"}
+    assert decoded["metadata"] == {"1": "one", "tags": ["a"]}
+    assert decoded["raw"] == "�bytes"
+    assert decoded["other"] == str(object)
+
+
+def test_progress_events_are_told_apart_from_status_payloads() -> None:
+    event = _encode_event({"type": "event", "message": "Tool start", "details": {}})
+
+    assert is_progress_event(event)
+    assert not is_progress_event(_SUCCESS_EVENT)
+    assert not is_progress_event(_encode_event({"type": "result", "message": "event"}))
@@ -0,0 +1,213 @@
+import asyncio
+import gzip
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from ..services import task_registry, tasks
+from ..services.task_registry import (
+    append_task_log_entries,
+    get_task_log_entries,
+    get_task_log_length,
+)
+
+
+def test_stream_log_round_trip(redis_client) -> None:
+    async def scenario() -> tuple:
+        await append_task_log_entries("t1", ['{"type": "log", "message": "a"}', "plain"])
+        return await get_task_log_entries("t1"), await get_task_log_length("t1")
+
+    entries, length = asyncio.run(scenario())
+
+    assert asyncio.run(redis_client.type("task:t1:log")) == "stream"
+    assert length == 2
+    assert [entry["payload"] for entry in entries] == [{"type": "log", "message": "a"}, "plain"]
+    assert all(entry["timestamp"] for entry in entries)
+
+
+def test_legacy_list_log_is_read_and_appended_in_place(redis_client) -> None:
+    legacy = orjson.dumps({"timestamp": "2024-01-01T00:00:00", "payload": "old"}).decode()
+
+    async def scenario() -> tuple:
+        await redis_client.rpush("task:t2:log", legacy, "not json")
+        await append_task_log_entries("t2", ["new"])
+        return await get_task_log_entries("t2"), await get_task_log_length("t2")
+
+    entries, length = asyncio.run(scenario())
+
+    assert asyncio.run(redis_client.type("task:t2:log")) == "list"
+    assert length == 3
+    assert entries[0] == {"timestamp": "2024-01-01T00:00:00", "payload": "old"}
+    assert entries[1] == {"timestamp": None, "payload": "not json"}
+    assert entries[2]["payload"] == "new"
+    assert entries[2]["timestamp"] is not None
+
+
+def test_missing_log_is_empty(redis_client) -> None:
+    assert asyncio.run(get_task_log_entries("missing")) == []
+    assert asyncio.run(get_task_log_length("missing")) == 0
+
+
+def test_persist_log_file_reads_in_chunks(redis_client, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(task_registry, "TASK_LOG_READ_CHUNK", 2)
+    monkeypatch.setattr(task_registry, "LOG_DIR", tmp_path)
+    legacy = [
+        orjson.dumps({"timestamp": f"2024-01-01T00:00:0{i}", "payload": f"old {i}"}).decode()
+        for i in range(3)
+    ]
+
+    async def scenario() -> None:
+        await append_task_log_entries("streamed", [f"line {i}" for i in range(5)])
+        await redis_client.rpush("task:legacy:log", *legacy)
+        await task_registry.persist_log_file("streamed")
+        await task_registry.persist_log_file("legacy")
+
+    asyncio.run(scenario())
+
+    streamed = gzip.decompress((tmp_path / "streamed.txt.gz").read_bytes()).decode()
+    streamed = streamed.splitlines()
+    assert [line.split("] ", 1)[1] for line in streamed] == [f"line {i}" for i in range(5)]
+    legacy_text = gzip.decompress((tmp_path / "legacy.txt.gz").read_bytes()).decode()
+    assert legacy_text.splitlines() == [
+        f"[2024-01-01T00:00:0{i}] old {i}" for i in range(3)
+    ]
+    assert asyncio.run(redis_client.hget("task:streamed", "log_file")) == str(
+        tmp_path / "streamed.txt.gz"
+    )
+
+
+def test_fetch_task_lists_returns_each_set_newest_first(redis_client) -> None:
+    async def scenario() -> dict:
+        await task_registry.register_task("old", "first", status="pending")
+        await task_registry.register_task("new", "second", status="pending")
+        await task_registry.register_task("done", "third")
+        await task_registry.finalize_task("done", "completed")
+        # Set members whose hash has expired are skipped.
+        await redis_client.sadd("tasks:pending", "gone")
+        await redis_client.hset("task:old", "created_at", "2000-01-01T00:00:00")
+        return await task_registry.fetch_task_lists(
+            ["tasks:pending", "tasks:completed", "tasks:failed"]
+        )
+
+    lists = asyncio.run(scenario())
+
+    assert [task["task_id"] for task in lists["tasks:pending"]] == ["new", "old"]
+    assert lists["tasks:pending"][0]["task"] == "second"
+    assert [task["status"] for task in lists["tasks:completed"]] == ["completed"]
+    assert lists["tasks:failed"] == []
+
+
+def test_get_task_summary_includes_log_length(redis_client) -> None:
+    async def scenario() -> dict:
+        await task_registry.register_task("t3", "task")
+        await append_task_log_entries("t3", ["a", "b"])
+        return await task_registry.get_task_summary("t3")
+
+    summary = asyncio.run(scenario())
+
+    assert summary["task_id"] == "t3"
+    assert summary["status"] == "running"
+    assert summary["log_length"] == 2
+
+
+def test_get_task_summary_missing_task(redis_client) -> None:
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(task_registry.get_task_summary("missing"))
+    assert excinfo.value.status_code == 404
+
+
+def test_fetch_task_lists_pages_through_large_sets(redis_client, monkeypatch) -> None:
+    monkeypatch.setattr(task_registry, "TASK_SCAN_COUNT", 7)
+
+    async def scenario() -> dict:
+        for index in range(60):
+            await task_registry.register_task(f"p{index:02d}", "task", status="pending")
+        return await task_registry.fetch_task_lists(["tasks:pending", "tasks:active"])
+
+    lists = asyncio.run(scenario())
+
+    assert sorted(task["task_id"] for task in lists["tasks:pending"]) == [
+        f"p{index:02d}" for index in range(60)
+    ]
+    assert lists["tasks:active"] == []
+
+
+def test_log_download_is_served_gzipped_or_decompressed(
+    redis_client, monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setattr(task_registry, "LOG_DIR", tmp_path)
+
+    async def scenario() -> tuple:
+        await task_registry.register_task("t6", "task")
+        await append_task_log_entries("t6", ["hello"])
+        compressed = await tasks.get_task_log_file("t6", "br, gzip;q=0.8")
+        refused = await tasks.get_task_log_file("t6", "gzip;q=0")
+        body = b"".join([chunk async for chunk in refused.body_iterator])
+        return compressed, refused, body
+
+    compressed, refused, body = asyncio.run(scenario())
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert gzip.decompress((tmp_path / "t6.txt.gz").read_bytes()).endswith(b"] hello\n")
+    assert "content-encoding" not in refused.headers
+    assert body.endswith(b"] hello\n")
+
+
+def test_updated_at_follows_the_newest_log_entry(redis_client) -> None:
+    async def scenario() -> tuple:
+        await task_registry.register_task("t7", "task")
+        await redis_client.hset("task:t7", "updated_at", "2000-01-01T00:00:00")
+        await append_task_log_entries("t7", ["line"])
+        stored = await redis_client.hget("task:t7", "updated_at")
+        metadata = await task_registry.get_task_metadata("t7")
+        summary = await task_registry.get_task_summary("t7")
+        listed = (await task_registry.fetch_task_lists(["tasks:active"]))["tasks:active"]
+        return stored, metadata, summary, listed
+
+    stored, metadata, summary, listed = asyncio.run(scenario())
+
+    assert stored == "2000-01-01T00:00:00"
+    assert metadata["updated_at"] > stored
+    assert summary["updated_at"] == metadata["updated_at"]
+    assert listed[0]["updated_at"] == metadata["updated_at"]
+
+
+def test_get_or_create_log_file_reuses_existing_file(redis_client, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(task_registry, "LOG_DIR", tmp_path)
+
+    async def scenario() -> tuple:
+        await task_registry.register_task("t8", "task")
+        await append_task_log_entries("t8", ["line"])
+        created = await task_registry.get_or_create_log_file("t8")
+        await append_task_log_entries("t8", ["later"])
+        return created, await task_registry.get_or_create_log_file("t8")
+
+    created, reused = asyncio.run(scenario())
+
+    assert reused == created
+    assert b"later" not in gzip.decompress(created.read_bytes())
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(task_registry.get_or_create_log_file("missing"))
+    assert excinfo.value.status_code == 404
+
+
+def test_concurrent_persists_replace_the_log_file_whole(
+    redis_client, monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setattr(task_registry, "TASK_LOG_READ_CHUNK", 2)
+    monkeypatch.setattr(task_registry, "LOG_DIR", tmp_path)
+
+    async def scenario() -> None:
+        await append_task_log_entries("t9", [f"line {i}" for i in range(7)])
+        await asyncio.gather(
+            task_registry.persist_log_file("t9"), task_registry.persist_log_file("t9")
+        )
+
+    asyncio.run(scenario())
+
+    text = gzip.decompress((tmp_path / "t9.txt.gz").read_bytes()).decode()
+    assert [line.split("] ", 1)[1] for line in text.splitlines()] == [
+        f"line {i}" for i in range(7)
+    ]
+    assert [path.name for path in tmp_path.iterdir()] == ["t9.txt.gz"]
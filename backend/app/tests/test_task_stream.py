@@ -0,0 +1,147 @@
+import asyncio
+from typing import AsyncIterator
+
+from ..services import tasks
+from ..services.tasks import ManagedTask, _detach_stream, _publish
+
+
+def _event(message: str) -> str:
+    return f'{{"type":"event","message":"{message}"}}'
+
+
+def test_publish_buffers_messages_and_closes_stream() -> None:
+    async def scenario() -> tuple:
+        managed = ManagedTask(task_text="t", prompt_template=None, llm_settings=None)
+        _publish(managed, _event("first"))
+        _publish(managed, '{"type":"success"}')
+        _publish(managed, None)
+        return (
+            [*managed.frames],
+            [*managed.control_frames],
+            managed.stream_closed,
+            managed.frames_ready.is_set(),
+        )
+
+    assert asyncio.run(scenario()) == (
+        [(1, _event("first"))],
+        [(2, '{"type":"success"}')],
+        True,
+        True,
+    )
+
+
+def test_publish_evicts_only_progress_frames_and_stops_after_detach(monkeypatch) -> None:
+    monkeypatch.setattr(tasks, "TASK_QUEUE_MAX", 2)
+    session = '{"type":"session","serverUrl":"http://mcp/sse"}'
+    result = '{"type":"result","message":"done"}'
+
+    async def scenario() -> tuple:
+        managed = ManagedTask(task_text="t", prompt_template=None, llm_settings=None)
+        _publish(managed, session)
+        for message in ("a", "b", "c"):
+            _publish(managed, _event(message))
+        _publish(managed, result)
+        sent = [*iter(lambda: tasks._next_frame(managed), None)]
+
+        _detach_stream(managed)
+        _publish(managed, _event("dropped"))
+        return sent, [*managed.frames, *managed.control_frames]
+
+    assert asyncio.run(scenario()) == ([session, _event("b"), _event("c"), result], [])
+
+
+def test_log_batcher_warns_and_continues_when_a_batch_fails(monkeypatch, caplog) -> None:
+    written: list = []
+
+    async def append(task_id: str, payloads: list) -> None:
+        if not written:
+            written.append(None)
+            raise RuntimeError("Redis operation failed: down")
+        written.extend(payloads)
+
+    monkeypatch.setattr(tasks, "append_task_log_entries", append)
+
+    async def scenario() -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(tasks._log_batcher("task-1", queue))
+        queue.put_nowait("lost")
+        await asyncio.sleep(0.05)
+        queue.put_nowait("kept")
+        queue.put_nowait(None)
+        await asyncio.wait_for(writer, timeout=1)
+
+    with caplog.at_level("WARNING", logger=tasks.__name__):
+        asyncio.run(scenario())
+
+    assert written == [None, "kept"]
+    assert "Dropped 1 log entries for task task-1" in caplog.text
+
+
+def test_stream_frames_coalesces_bursts_and_caps_write_size(monkeypatch) -> None:
+    monkeypatch.setattr(tasks, "TASK_SSE_MAX_WRITE", 30)
+
+    async def scenario() -> list:
+        managed = ManagedTask(task_text="t", prompt_template=None, llm_settings=None)
+        writes = []
+
+        async def consume() -> None:
+            async for chunk in tasks._stream_frames(managed):
+                writes.append(chunk)
+
+        reader = asyncio.create_task(consume())
+        for message in ("one", "two", "three", "x" * 50):
+            _publish(managed, message)
+        await asyncio.sleep(0.05)
+        _publish(managed, "last")
+        _publish(managed, None)
+        await asyncio.wait_for(reader, timeout=1)
+        return writes
+
+    assert asyncio.run(scenario()) == [
+        b"data: one\n\ndata: two\n\ndata: three\n\n",
+        b"data: " + b"x" * 50 + b"\n\n",
+        b"data: last\n\n",
+    ]
+
+
+def test_background_log_persist_logs_failures(monkeypatch, caplog) -> None:
+    async def persist(task_id: str) -> None:
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(tasks, "persist_log_file", persist)
+
+    with caplog.at_level("ERROR", logger=tasks.__name__):
+        asyncio.run(tasks._persist_log_quietly("task-2"))
+
+    assert "Failed to persist the log file for task task-2" in caplog.text
+    assert "No space left on device" in caplog.text
+
+
+def test_agent_worker_cleans_up_when_the_log_writer_dies(
+    redis_client, monkeypatch, caplog
+) -> None:
+    monkeypatch.setattr(tasks, "TASK_LOG_QUEUE_MAX", 2)
+
+    async def events(*args) -> AsyncIterator[str]:
+        for index in range(5):
+            yield f"event {index}"
+
+    async def append(task_id: str, payloads: list) -> None:
+        raise ValueError("unexpected reply")
+
+    monkeypatch.setattr(tasks, "stream_agent_events", events)
+    monkeypatch.setattr(tasks, "append_task_log_entries", append)
+
+    async def scenario() -> ManagedTask:
+        managed = ManagedTask(task_text="t", prompt_template=None, llm_settings=None)
+        tasks._tasks["task-3"] = managed
+        await asyncio.wait_for(tasks._agent_worker("task-3", managed), timeout=1)
+        return managed
+
+    with caplog.at_level("ERROR", logger=tasks.__name__):
+        managed = asyncio.run(scenario())
+
+    assert managed.status == "completed"
+    assert managed.stream_closed and managed.done.is_set()
+    assert "task-3" not in tasks._tasks
+    assert "Log writer for task task-3 failed" in caplog.text
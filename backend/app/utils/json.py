@@ -1,23 +1,24 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Iterable, List, Mapping, Sequence
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
 
+import orjson
 
-def dump_list(values: Sequence[str]) -> str:
-    return json.dumps(list(values), ensure_ascii=False)
+
+def dump_list(values: Sequence[Any]) -> str:
+    return orjson.dumps(list(values)).decode("utf-8")
 
 
 def dump_dict(values: Mapping[str, Any]) -> str:
-    return json.dumps(dict(values), ensure_ascii=False)
+    return orjson.dumps(dict(values), option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
 
 def load_json_list(raw: str) -> List[Any]:
     if not raw:
         return []
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return []
     if isinstance(data, list):
         return data
@@ -28,8 +29,8 @@ def load_dict(raw: str) -> Dict[str, Any]:
     if not raw:
         return {}
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return {}
     if isinstance(data, dict):
         return data
@@ -39,3 +40,21 @@ def load_dict(raw: str) -> Dict[str, Any]:
 def load_string_list(raw: str) -> List[str]:
     values = load_json_list(raw)
     return [str(value) for value in values]
+
+
+def parse_event_payload(payload: str) -> Tuple[str, str]:
+    """Split a streamed agent payload into its ``(type, message)`` pair.
+
+    Anything that is not a JSON object is treated as a plain info message.
+    The first character is checked before decoding so plain text lines do not
+    pay for a failed parse.
+    """
+    if not payload or payload[0] not in "{[":
+        return "info", payload
+    try:
+        data = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        return "info", payload
+    if not isinstance(data, dict):
+        return "info", payload
+    return str(data.get("type", "info")), str(data.get("message", ""))
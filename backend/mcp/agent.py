@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from typing import Any, AsyncIterator, Callable, Dict, Optional
+from contextlib import suppress
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
 
+import orjson
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from mcp_use import MCPAgent, MCPClient
@@ -12,30 +16,98 @@ from .patches import apply_mcp_use_patches
 
 apply_mcp_use_patches()
 
-from .config import build_mcp_config
+from .config import mcp_config_json
 from .events import (
-    prepare_stream_event,
+    coerce_stream_value,
     should_skip_stream_event,
     summarize_stream_event,
 )
 
+load_dotenv()
+
 DEFAULT_SERVER_FALLBACK = "http://10.160.13.110:8882/sse"
 
+# One client per MCP server URL, stored with the serialised config it was
+# built from. The session pool hands each URL to a single task at a time, so a
+# client's sessions are never shared between live runs.
+_clients: Dict[str, Tuple[str, MCPClient]] = {}
+
+
+def _encode_event(payload: Dict[str, Any]) -> str:
+    try:
+        return orjson.dumps(
+            payload, default=coerce_stream_value, option=orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    except orjson.JSONEncodeError:  # pragma: no cover - e.g. integers beyond 64 bits
+        return json.dumps(payload, default=coerce_stream_value)
+
+
+# Encoded intermediate agent events start with one of these; every other
+# payload (start, success, result, error) reports the run's status.
+_PROGRESS_EVENT_PREFIXES = ('{"type":"event"', '{"type": "event"')
+
+
+def is_progress_event(message: str) -> bool:
+    """Return whether ``message`` is an intermediate agent event."""
+    return message.startswith(_PROGRESS_EVENT_PREFIXES)
+
+
+# Events whose content never changes are encoded once.
+_STARTED_EVENT = _encode_event({"type": "info", "message": "Starting task execution."})
+_SUCCESS_EVENT = _encode_event({"type": "success", "message": "Task completed."})
+_NO_RESULT_EVENT = _encode_event({"type": "result", "message": "No final response returned."})
+
+
+@lru_cache(maxsize=32)
+def _cached_llm(
+    model: Optional[str], base_url: Optional[str], api_key: Optional[str]
+) -> ChatOpenAI:
+    return ChatOpenAI(model=model, base_url=base_url, api_key=api_key)
+
 
 def _create_llm(llm_settings: Optional[Dict[str, str]]) -> ChatOpenAI:
     if llm_settings:
-        return ChatOpenAI(
-            model=llm_settings["model_name"],
-            base_url=llm_settings["base_url"],
-            api_key=llm_settings["api_key"],
+        return _cached_llm(
+            llm_settings["model_name"],
+            llm_settings["base_url"],
+            llm_settings["api_key"],
         )
-    return ChatOpenAI(
-        model=os.getenv("OPENAI_MODEL"),
-        base_url=os.getenv("OPENAI_BASE_URL"),
-        api_key=os.getenv("OPENAI_API_KEY"),
+    return _cached_llm(
+        os.getenv("OPENAI_MODEL"),
+        os.getenv("OPENAI_BASE_URL"),
+        os.getenv("OPENAI_API_KEY"),
     )
 
 
+async def _get_client(server_url: str) -> MCPClient:
+    # The config also depends on the environment and MCP_SERVERS_FILE, so a
+    # cached client is only reused while it was built from the same config.
+    config_key = mcp_config_json(server_url)
+    cached = _clients.get(server_url)
+    if cached is not None:
+        cached_key, client = cached
+        if cached_key == config_key:
+            return client
+        await _discard_client(server_url, client)
+    client = MCPClient.from_dict(json.loads(config_key))
+    _clients[server_url] = (config_key, client)
+    return client
+
+
+async def _discard_client(server_url: str, client: MCPClient) -> None:
+    cached = _clients.get(server_url)
+    if cached is not None and cached[1] is client:
+        del _clients[server_url]
+    with suppress(Exception):  # pragma: no cover - defensive
+        await client.close_all_sessions()
+
+
+async def close_agent_clients() -> None:
+    """Close the sessions of every cached MCP client."""
+    for server_url, (_, client) in list(_clients.items()):
+        await _discard_client(server_url, client)
+
+
 async def stream_agent_events(
     task: str,
     server_url: Optional[str],
@@ -45,45 +117,49 @@ async def stream_agent_events(
 ) -> AsyncIterator[str]:
     """Stream JSON-encoded events from the MCP agent for a given task."""
 
-    load_dotenv()
-
     resolved_server_url = server_url or os.getenv("MCP_SERVER_URL", DEFAULT_SERVER_FALLBACK)
 
-    client = MCPClient.from_dict(build_mcp_config(resolved_server_url))
+    client = await _get_client(resolved_server_url)
     llm = _create_llm(llm_settings)
     agent = MCPAgent(llm=llm, client=client, max_steps=30)
 
     final_prompt = render_prompt(task, prompt_template)
 
-    yield json.dumps({"type": "info", "message": "Starting task execution."})
+    yield _STARTED_EVENT
 
     final_result: Optional[str] = None
     try:
-        async for raw_event in agent.stream_events(final_prompt, max_steps=30):
-            safe_event = prepare_stream_event(raw_event)
-            if should_skip_stream_event(safe_event):
+        async for event in agent.stream_events(final_prompt, max_steps=30):
+            if should_skip_stream_event(event):
                 continue
-            message, result_candidate = summarize_stream_event(safe_event)
+            message, result_candidate = summarize_stream_event(event)
+            # Non-JSON values in the event are coerced while it is encoded.
             payload: Dict[str, Any] = {
                 "type": "event",
                 "message": message,
-                "details": safe_event,
+                "details": event,
             }
-            event_name = safe_event.get("event")
+            event_name = event.get("event")
             if isinstance(event_name, str) and event_name:
                 payload["eventName"] = event_name
-            event_source = safe_event.get("name")
+            event_source = event.get("name")
             if isinstance(event_source, str) and event_source:
                 payload["eventSource"] = event_source
-            yield json.dumps(payload)
+            yield _encode_event(payload)
             if result_candidate:
                 final_result = result_candidate
+    except asyncio.CancelledError:
+        # A cancelled run can leave a tool call half-finished on the session.
+        await _discard_client(resolved_server_url, client)
+        raise
     except Exception as exc:  # pragma: no cover - defensive
-        yield json.dumps({"type": "error", "message": str(exc)})
+        # The client's sessions may be broken; reconnect on the next run.
+        await _discard_client(resolved_server_url, client)
+        yield _encode_event({"type": "error", "message": str(exc)})
         raise
 
-    yield json.dumps({"type": "success", "message": "Task completed."})
+    yield _SUCCESS_EVENT
     if final_result:
-        yield json.dumps({"type": "result", "message": final_result})
+        yield _encode_event({"type": "result", "message": final_result})
     else:
-        yield json.dumps({"type": "result", "message": "No final response returned."})
+        yield _NO_RESULT_EVENT
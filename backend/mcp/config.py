@@ -3,8 +3,9 @@ from __future__ import annotations
 import json
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -102,8 +103,7 @@ def _load_servers_from_file(path: Path) -> Dict[str, Dict[str, Any]]:
     return _normalise_server_mapping(decoded)
 
 
-def build_mcp_config(primary_url: str) -> Dict[str, Any]:
-    """Compose the MCP client configuration for the agent runner."""
+def _compose_mcp_config(primary_url: str) -> Dict[str, Any]:
     primary_name = os.getenv("MCP_PRIMARY_SERVER_NAME", "http")
     servers: Dict[str, Dict[str, Any]] = {}
 
@@ -138,3 +138,47 @@ def build_mcp_config(primary_url: str) -> Dict[str, Any]:
     return {"mcpServers": servers}
 
 
+_CONFIG_ENV_VARS = (
+    "MCP_PRIMARY_SERVER_NAME",
+    "MCP_SERVERS_FILE",
+    "MCP_PRIMARY_SERVER_ALIASES",
+    "MCP_GMAIL_OTP_URL",
+    "MCP_GMAIL_OTP_SERVER_NAME",
+    "MCP_ADDITIONAL_SERVERS",
+)
+
+
+def _config_fingerprint() -> Tuple[Optional[Union[str, int]], ...]:
+    # Everything the composed config depends on, including the servers file's
+    # modification time and size so edits on disk are picked up even when the
+    # filesystem's timestamp granularity hides them.
+    config_path = os.getenv("MCP_SERVERS_FILE")
+    modified: Optional[int] = None
+    size: Optional[int] = None
+    if config_path:
+        try:
+            stat = Path(config_path).expanduser().stat()
+        except OSError:
+            pass
+        else:
+            modified, size = stat.st_mtime_ns, stat.st_size
+    return (*(os.getenv(name) for name in _CONFIG_ENV_VARS), modified, size)
+
+
+@lru_cache(maxsize=32)
+def _cached_config_json(primary_url: str, fingerprint: Tuple[Any, ...]) -> str:
+    return json.dumps(_compose_mcp_config(primary_url), sort_keys=True)
+
+
+def mcp_config_json(primary_url: str) -> str:
+    """Return ``build_mcp_config(primary_url)`` as sorted-key JSON.
+
+    The result is cached until the environment or the servers file changes,
+    so repeated calls skip reading and parsing the file.
+    """
+    return _cached_config_json(primary_url, _config_fingerprint())
+
+
+def build_mcp_config(primary_url: str) -> Dict[str, Any]:
+    """Compose the MCP client configuration for the agent runner."""
+    return json.loads(mcp_config_json(primary_url))
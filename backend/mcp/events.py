@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Optional, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Optional, Sequence
 
 from langchain_core.messages import BaseMessage
 
@@ -11,78 +12,86 @@ def truncate_text(text: str, limit: int = 160) -> str:
     return text[: limit - 1] + "…"
 
 
-def extract_first_text(value: Any, preferred_keys: Sequence[str] = ()) -> Optional[str]:
-    if isinstance(value, str):
-        return value
-    if isinstance(value, (int, float, bool)):
-        return str(value)
-    if isinstance(value, dict):
-        if preferred_keys:
-            for key in preferred_keys:
-                candidate = extract_first_text(value.get(key), preferred_keys)
-                if candidate:
-                    return candidate
-        for key in value:
-            candidate = extract_first_text(value[key], preferred_keys)
-            if candidate:
-                return candidate
+def _message_dict(message: BaseMessage) -> dict[str, Any]:
+    return {"type": message.type, "content": message.content}
+
+
+@lru_cache(maxsize=256)
+def _coercer(value_type: type) -> Optional[Callable[[Any], Any]]:
+    """Return how to turn instances of ``value_type`` into plain data, if at all.
+
+    The attribute probing happens once per class rather than once per value.
+    """
+    if issubclass(value_type, BaseMessage):
+        return _message_dict
+    methods = tuple(method for method in ("model_dump", "dict") if hasattr(value_type, method))
+    if not methods:
         return None
-    if isinstance(value, (list, tuple, set)):
-        for item in value:
-            candidate = extract_first_text(item, preferred_keys)
-            if candidate:
-                return candidate
+
+    def dump(value: Any) -> Any:
+        for method in methods:
+            try:
+                dumped = getattr(value, method)()
+            except Exception:  # pragma: no cover - defensive
+                dumped = None
+            if dumped is not None:
+                return dumped
         return None
-    if isinstance(value, BaseMessage):
-        return extract_first_text(value.content, preferred_keys)
-    if hasattr(value, "model_dump"):
-        try:
-            dumped = value.model_dump()
-        except Exception:  # pragma: no cover - defensive
-            dumped = None
-        if dumped is not None:
-            return extract_first_text(dumped, preferred_keys)
-    if hasattr(value, "dict"):
-        try:
-            dumped = value.dict()
-        except Exception:  # pragma: no cover - defensive
-            dumped = None
-        if dumped is not None:
-            return extract_first_text(dumped, preferred_keys)
+
+    return dump
+
+
+def extract_first_text(value: Any, preferred_keys: Sequence[str] = ()) -> Optional[str]:
+    # Depth-first with an explicit stack; at every mapping the preferred keys
+    # are visited before the remaining values, in order.
+    stack: list[Any] = [value]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, str):
+            if current:
+                return current
+        elif isinstance(current, (int, float, bool)):
+            return str(current)
+        elif isinstance(current, dict):
+            children = [current.get(key) for key in preferred_keys]
+            children.extend(current.values())
+            stack.extend(reversed(children))
+        elif isinstance(current, (list, tuple, set)):
+            stack.extend(reversed(list(current)))
+        else:
+            # Messages take the same shape they have in the encoded event.
+            coerce = _coercer(type(current))
+            dumped = coerce(current) if coerce else None
+            if dumped is not None:
+                stack.append(dumped)
     return None
 
 
-def prepare_stream_event(value: Any) -> Any:
-    if isinstance(value, dict):
-        return {str(key): prepare_stream_event(val) for key, val in value.items()}
-    if isinstance(value, (list, tuple, set)):
-        return [prepare_stream_event(item) for item in value]
-    if isinstance(value, BaseMessage):
-        return {"type": value.type, "content": prepare_stream_event(value.content)}
-    if hasattr(value, "model_dump"):
-        try:
-            dumped = value.model_dump()
-        except Exception:  # pragma: no cover - defensive
-            dumped = None
-        if dumped is not None:
-            return prepare_stream_event(dumped)
-    if hasattr(value, "dict"):
-        try:
-            dumped = value.dict()
-        except Exception:  # pragma: no cover - defensive
-            dumped = None
-        if dumped is not None:
-            return prepare_stream_event(dumped)
-    if isinstance(value, bytes):
+def coerce_stream_value(value: Any) -> Any:
+    """``default`` hook that makes agent events JSON-safe while encoding.
+
+    The encoder only calls it for values it cannot serialise natively, so the
+    JSON-native parts of an event are never copied.
+    """
+    if isinstance(value, (bytes, bytearray)):
         return value.decode("utf-8", errors="replace")
-    if isinstance(value, (str, int, float, bool)) or value is None:
-        return value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    coerce = _coercer(type(value))
+    dumped = coerce(value) if coerce else None
+    if dumped is not None:
+        return dumped
     return str(value)
 
 
+_CHAT_MODEL_STREAM = "on_chat_model_stream"
+_AI_MESSAGE_CHUNK = "AIMessageChunk"
+
+
 def should_skip_stream_event(event: dict[str, Any]) -> bool:
-    event_type = str(event.get("event") or "")
-    if event_type != "on_chat_model_stream":
+    # Runs once per streamed token, and nearly every event that gets here is a
+    # token chunk, so the checks are ordered to settle that case quickly.
+    if event.get("event") != _CHAT_MODEL_STREAM:
         return False
 
     data = event.get("data")
@@ -90,18 +99,13 @@ def should_skip_stream_event(event: dict[str, Any]) -> bool:
         return False
 
     chunk = data.get("chunk")
-    if isinstance(chunk, dict):
+    if isinstance(chunk, BaseMessage):
+        chunk_type = chunk.type
+    elif isinstance(chunk, dict):
         chunk_type = chunk.get("type")
-        if isinstance(chunk_type, str) and chunk_type == "AIMessageChunk":
-            return True
-    elif isinstance(chunk, str) and chunk == "AIMessageChunk":
-        return True
-
-    chunk_type = data.get("chunk_type")
-    if isinstance(chunk_type, str) and chunk_type == "AIMessageChunk":
-        return True
-
-    return False
+    else:
+        chunk_type = chunk
+    return chunk_type == _AI_MESSAGE_CHUNK or data.get("chunk_type") == _AI_MESSAGE_CHUNK
 
 
 def summarize_stream_event(event: dict[str, Any]) -> tuple[str, Optional[str]]:
@@ -128,7 +132,7 @@ def summarize_stream_event(event: dict[str, Any]) -> tuple[str, Optional[str]]:
         label_parts.append(event_type.replace("_", " ").title())
     if event_name:
         label_parts.append(event_name)
-    message = " · ".join(label_parts) if label_parts else "Agent event"
+    message = " · ".join(label_parts) or "Agent event"
     if snippet:
         message = f"{message}: {truncate_text(snippet)}"
 
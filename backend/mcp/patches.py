@@ -80,11 +80,22 @@ def apply_mcp_use_patches() -> None:
         if limit is None:
             return original_parse(self, tool_result)
 
+        content = tool_result.content or []
+        # Most tool calls return a little text; return it without the
+        # per-item truncation bookkeeping.
+        texts = [
+            getattr(item, "text", "") or ""
+            for item in content
+            if getattr(item, "type", None) == "text"
+        ]
+        if len(texts) == len(content) and sum(map(len, texts)) <= limit:
+            return "".join(texts)
+
         parts: list[str] = []
         omitted_total = 0
         remaining = limit
 
-        for item in tool_result.content or []:
+        for item in content:
             item_type = getattr(item, "type", None)
 
             if item_type == "text":
@@ -127,16 +138,25 @@ def apply_mcp_use_patches() -> None:
             remaining, omitted = _append_text(parts, placeholder, remaining)
             omitted_total += omitted
 
-        result = "".join(parts)
-        if omitted_total > 0:
-            notice = _NOTICE_TEMPLATE.format(limit=limit, omitted=omitted_total)
-            if len(notice) >= limit:
-                return notice[:limit]
-            allowed_prefix = limit - len(notice)
-            if len(result) > allowed_prefix:
-                result = result[:allowed_prefix]
-            result += notice
-        return result
+        if omitted_total <= 0:
+            return "".join(parts)
+
+        notice = _NOTICE_TEMPLATE.format(limit=limit, omitted=omitted_total)
+        if len(notice) >= limit:
+            return notice[:limit]
+        # Trim the parts to leave room for the notice and join once, rather
+        # than joining, slicing and concatenating copies of the output.
+        budget = limit - len(notice)
+        kept: list[str] = []
+        for part in parts:
+            if budget <= 0:
+                break
+            if len(part) > budget:
+                part = part[:budget]
+            kept.append(part)
+            budget -= len(part)
+        kept.append(notice)
+        return "".join(kept)
 
     LangChainAdapter._parse_mcp_tool_result = _patched_parse
     LangChainAdapter._mcp_portal_tool_patch = True